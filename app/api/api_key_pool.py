@@ -0,0 +1,125 @@
+import time
+from datetime import datetime, timedelta, UTC
+
+from app.api.rate_limiter import HostRateLimiter
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class NoApiKeyAvailable(Exception):
+    """Every key is on cooldown."""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"No API key available for the next {retry_in:.0f} sec.")
+        self.retry_in = retry_in
+
+
+class ApiKeyPool:
+    """
+    API keys with their remaining quota, as reported by the API's quota headers.
+
+    Each request takes the key with the most headroom; keys that run out are put on cooldown
+    until their quota resets instead of being retried. acquire() and release() never await,
+    so concurrent callers on the event loop cannot pick a key based on stale state.
+    """
+
+    def __init__(self, keys: list, quota_left_header: str = "X-API-Quota-Left",
+                 quota_used_header: str = "X-API-Quota-Used", rate_limit_cooldown: float = 60):
+        """
+        :param keys: API keys.
+        :param quota_left_header: Response header with the quota left for the key.
+        :param quota_used_header: Response header with the quota used by the key.
+        :param rate_limit_cooldown: Seconds a key rests after a 429 without Retry-After.
+        """
+        self.quota_left_header = quota_left_header
+        self.quota_used_header = quota_used_header
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self._keys = {
+            key: {"quota_left": None, "quota_used": None, "cooldown_until": 0.0, "in_flight": 0,
+                  "requests": 0, "exhausted": 0}
+            for key in dict.fromkeys(keys)
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def mask(key: str) -> str:
+        """Returns a key shortened for logs and metrics."""
+        return f"{key[:4]}..." if len(key) > 4 else "***"
+
+    @staticmethod
+    def _seconds_until_quota_reset() -> float:
+        # Daily quotas reset at midnight UTC
+        now = datetime.now(UTC)
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight - now).total_seconds()
+
+    def acquire(self) -> str:
+        """
+        Takes the available key with the most quota left (unknown quota counts as the most).
+
+        :raises NoApiKeyAvailable: If every key is on cooldown.
+        """
+        now = time.monotonic()
+        available = [key for key, state in self._keys.items() if state["cooldown_until"] <= now]
+        if not available:
+            retry_in = min((state["cooldown_until"] for state in self._keys.values()), default=now) - now
+            raise NoApiKeyAvailable(max(retry_in, 0))
+
+        def headroom(key):
+            state = self._keys[key]
+            quota_left = float("inf") if state["quota_left"] is None else state["quota_left"]
+            # Spread concurrent requests over keys with the same headroom
+            return quota_left, -state["in_flight"]
+
+        key = max(available, key=headroom)
+        self._keys[key]["in_flight"] += 1
+        self._keys[key]["requests"] += 1
+        return key
+
+    def release(self, key: str, status_code: int = None, headers=None) -> None:
+        """
+        Returns a key after its request, recording the quota the response reported.
+
+        :param key: Key returned by acquire().
+        :param status_code: Response status, None if the request failed without a response.
+        :param headers: Response headers.
+        """
+        state = self._keys[key]
+        state["in_flight"] -= 1
+        headers = headers or {}
+
+        for header, field in ((self.quota_left_header, "quota_left"), (self.quota_used_header, "quota_used")):
+            try:
+                state[field] = float(headers[header])
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        cooldown = None
+        if status_code == 429:
+            cooldown = HostRateLimiter.parse_retry_after(headers.get("Retry-After")) or self.rate_limit_cooldown
+        elif status_code == 402 or (state["quota_left"] is not None and state["quota_left"] <= 0):
+            cooldown = self._seconds_until_quota_reset()
+            state["exhausted"] += 1
+
+        if cooldown is not None:
+            state["cooldown_until"] = max(state["cooldown_until"], time.monotonic() + cooldown)
+            logger.warning(f"API key {self.mask(key)} is on cooldown for {cooldown:.0f} sec.")
+
+    def snapshot(self) -> list:
+        """Returns the state of every key (masked), e.g. for metrics."""
+        now = time.monotonic()
+        return [
+            {
+                "key": self.mask(key),
+                "quota_left": state["quota_left"],
+                "quota_used": state["quota_used"],
+                "cooldown_seconds": round(max(state["cooldown_until"] - now, 0), 1),
+                "in_flight": state["in_flight"],
+                "requests": state["requests"],
+                "exhausted": state["exhausted"],
+            }
+            for key, state in self._keys.items()
+        ]
@@ -0,0 +1,86 @@
+from contextlib import asynccontextmanager
+from importlib.util import find_spec
+
+import httpx
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class HTTPClientManager:
+    _instance = None
+
+    def __new__(cls):
+        """ Singleton pattern to share one pooled HTTP client across API clients """
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.client = None
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, 'client'):
+            self.client = None
+
+    @staticmethod
+    def _build_client(**overrides) -> httpx.AsyncClient:
+        """ Creates an AsyncClient with the configured pool limits, keep-alive and HTTP/2 """
+        http2 = Config.HTTP2_ENABLED
+        if http2 and find_spec("h2") is None:
+            logger.warning("HTTP/2 is enabled but the 'h2' package is not installed. Falling back to HTTP/1.1.")
+            http2 = False
+
+        options = {
+            "timeout": Config.HTTP_TIMEOUT,
+            "limits": httpx.Limits(
+                max_connections=Config.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            "http2": http2,
+        }
+        options.update(overrides)
+        return httpx.AsyncClient(**options)
+
+    async def start(self) -> None:
+        """ Opens the shared HTTP client if it is not open yet """
+        if self.client is None or self.client.is_closed:
+            self.client = self._build_client()
+            logger.info("Shared HTTP client started")
+
+    def get_client(self) -> httpx.AsyncClient | None:
+        """ Returns the shared HTTP client, or None if it has not been started """
+        if self.client is None or self.client.is_closed:
+            return None
+        return self.client
+
+    @asynccontextmanager
+    async def session(self, **overrides):
+        """
+        Yields the shared HTTP client.
+
+        Outside the application lifespan (tests, one-off scripts) a short-lived client
+        is created and closed on exit, so callers never have to care which one they got.
+        """
+        client = self.get_client()
+        if client is not None and not overrides:
+            yield client
+            return
+
+        async with self._build_client(**overrides) as client:
+            yield client
+
+    async def close(self) -> None:
+        """ Closes the shared HTTP client """
+        if self.client:
+            try:
+                await self.client.aclose()
+                logger.info("Shared HTTP client closed")
+            except Exception as e:
+                logger.error(f"Error closing HTTP client: {e}")
+            finally:
+                self.client = None
+
+
+http_client = HTTPClientManager()
@@ -1,12 +1,17 @@
 import asyncio
 import base64
 import json
+import os
+import socket
 import time
 
 import httpx
+from pymongo.errors import PyMongoError
 
 print(f"Imported httpx in: {__name__}")
 
+from app.api.http_client import http_client
+from app.api.rate_limiter import rate_limiter
 from app.config.config import Config
 from app.config.logger_config import LoggerConfig
 
@@ -20,9 +25,16 @@ class KrogerAPIClient:
     KROGER_API_CLIENT_ID = Config.KROGER_API_CLIENT_ID
     KROGER_API_CLIENT_SECRET = Config.KROGER_API_CLIENT_SECRET
 
+    # The Kroger API does not accept filter.start above this value
+    MAX_START = 250
+
     # Global Token Cache
     token_cache = {"access_token": None, "expires_at": 0}
-    _token_lock = asyncio.Lock()
+    # Shared token store (see use_token_store), None keeps the token per process
+    token_store = None
+    _refresh_task: asyncio.Task | None = None
+    # Identifies this process when it takes the refresh lease in the token store
+    _token_owner = f"{socket.gethostname()}:{os.getpid()}"
 
     def __init__(self, keyword: str, location_id: str = None):
         """
@@ -40,22 +52,119 @@ class KrogerAPIClient:
         # Max items per request
         self.limit = 50
 
+    @classmethod
+    def use_token_store(cls, token_store) -> None:
+        """
+        Shares the token through a store (e.g. TokenRepository) instead of keeping it per process.
+
+        :param token_store: Anything with get(name), save(name, access_token, expires_at)
+                            and try_lease(name, owner, seconds); None goes back to per-process tokens.
+        """
+        cls.token_store = token_store
+
     @classmethod
     async def _get_kroger_token(cls):
-        """Fetches a token from the Kroger API using caching."""
+        """
+        Returns a valid token, fetching one only when there is none.
 
-        async with cls._token_lock:
-            current_time = time.time()
-            # Return cached token if still valid
-            if cls.token_cache["access_token"] and cls.token_cache["expires_at"] > current_time:
-                return cls.token_cache["access_token"]
+        A valid token is returned without waiting on anything. Within KROGER_TOKEN_REFRESH_MARGIN
+        of its expiry it is still returned, while a replacement is fetched in the background.
+        Concurrent callers share one refresh (single flight).
+        """
+        access_token = cls.token_cache["access_token"]
+        expires_at = cls.token_cache["expires_at"]
+        current_time = time.time()
 
-            # If the token is missing or expired, request a new one
-            credentials = base64.b64encode(
-                f"{cls.KROGER_API_CLIENT_ID}:{cls.KROGER_API_CLIENT_SECRET}".encode()).decode()
+        if access_token and expires_at > current_time:
+            if expires_at - current_time <= Config.KROGER_TOKEN_REFRESH_MARGIN:
+                cls._refresh_in_background()
+            return access_token
 
-            async with httpx.AsyncClient(timeout=10) as client:
-                try:
+        # Shielded: a caller that gets cancelled must not cancel the refresh for the others
+        return await asyncio.shield(cls._refresh_token())
+
+    @classmethod
+    def _refresh_token(cls) -> asyncio.Task:
+        """Returns the refresh in flight, starting one if there is none."""
+        task = cls._refresh_task
+        if task is None or task.done():
+            task = asyncio.create_task(cls._load_or_fetch_token())
+            cls._refresh_task = task
+        return task
+
+    @classmethod
+    def _refresh_in_background(cls) -> None:
+        task = cls._refresh_token()
+        if not task.done():
+            task.add_done_callback(cls._log_background_failure)
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Task) -> None:
+        # Retrieving the exception keeps asyncio from reporting it as never retrieved;
+        # the current token stays in use until it expires
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background token refresh failed: {task.exception()}")
+
+    @classmethod
+    def _cache_token(cls, access_token: str, expires_at: float) -> str:
+        # Replaced as a whole, so lock-free readers never see a token with another token's expiry
+        cls.token_cache = {"access_token": access_token, "expires_at": expires_at}
+        return access_token
+
+    @classmethod
+    async def _load_or_fetch_token(cls) -> str:
+        """Takes the token from the shared store if another process refreshed it, fetches one otherwise."""
+        store = cls.token_store
+        if store is None:
+            token_data, expires_at = await cls._fetch_token()
+            return cls._cache_token(token_data["access_token"], expires_at)
+
+        name = f"kroger:{cls.KROGER_API_CLIENT_ID}"
+        try:
+            stored = await cls._load_stored_token(store, name)
+            if stored:
+                return stored
+            lease_seconds = Config.HTTP_TIMEOUT * 2
+            if not await store.try_lease(name, cls._token_owner, lease_seconds):
+                # Another process is fetching the token: wait for it rather than fetch a second one
+                deadline = time.monotonic() + lease_seconds
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(0.5)
+                    stored = await cls._load_stored_token(store, name)
+                    if stored:
+                        return stored
+                logger.warning("The shared Kroger token was not refreshed in time, fetching one here")
+        except PyMongoError as e:
+            logger.warning(f"Kroger token store unavailable, fetching a token here: {e}")
+            store = None
+
+        token_data, expires_at = await cls._fetch_token()
+        if store is not None:
+            try:
+                await store.save(name, token_data["access_token"], expires_at)
+            except PyMongoError as e:
+                logger.warning(f"Could not share the Kroger token: {e}")
+        return cls._cache_token(token_data["access_token"], expires_at)
+
+    @classmethod
+    async def _load_stored_token(cls, store, name: str) -> str | None:
+        """Caches and returns the stored token if it is not due for a refresh yet."""
+        stored = await store.get(name)
+        if (stored and stored.get("access_token")
+                and stored.get("expires_at", 0) - time.time() > Config.KROGER_TOKEN_REFRESH_MARGIN):
+            return cls._cache_token(stored["access_token"], stored["expires_at"])
+        return None
+
+    @classmethod
+    async def _fetch_token(cls) -> tuple:
+        """Requests a new token from the Kroger API, returning the token data and its expiry time."""
+        current_time = time.time()
+        credentials = base64.b64encode(
+            f"{cls.KROGER_API_CLIENT_ID}:{cls.KROGER_API_CLIENT_SECRET}".encode()).decode()
+
+        async with http_client.session() as client:
+            try:
+                async with rate_limiter.limit(cls.KROGER_API_TOKEN_URL):
                     response = await client.post(
                         cls.KROGER_API_TOKEN_URL,
                         headers={
@@ -65,41 +174,54 @@ class KrogerAPIClient:
                         data={"grant_type": "client_credentials", "scope": "product.compact"},
                     )
 
-                    if response.status_code == 200:
-                        try:
-                            token_data = await response.json()
-                        except Exception as e:
-                            logger.error(f"Invalid JSON response: {e}")
-                            raise Exception(f"Invalid JSON response: {e}")
-                        cls.token_cache["access_token"] = token_data.get("access_token")
-                        cls.token_cache["expires_at"] = current_time + token_data.get("expires_in", 0)
-                        return token_data["access_token"]
-                    else:
-                        logger.error(f"Failed to get access token: {response.text}")
-                        raise Exception(f"Failed to get access token: {response.text}")
-
-                except httpx.HTTPError as e:
-                    logger.error(f"Request error while fetching token: {e}")
-                    raise Exception(f"Request error while fetching token: {e}")
-
-    async def _get_products(self):
-        """Executes a request to the Kroger API."""
+                if response.status_code == 200:
+                    try:
+                        token_data = await response.json()
+                    except Exception as e:
+                        logger.error(f"Invalid JSON response: {e}")
+                        raise Exception(f"Invalid JSON response: {e}")
+                    return token_data, current_time + token_data.get("expires_in", 0)
+                else:
+                    logger.error(f"Failed to get access token: {response.text}")
+                    raise Exception(f"Failed to get access token: {response.text}")
+
+            except httpx.HTTPError as e:
+                logger.error(f"Request error while fetching token: {e}")
+                raise Exception(f"Request error while fetching token: {e}")
+
+    async def _get_products(self, start: int = None):
+        """
+        Executes a request to the Kroger API.
+
+        :param start: Pagination offset, defaults to the client's current offset.
+        """
+        start = self.start if start is None else start
 
         # Always use the latest token
         token = await self._get_kroger_token()
 
-        async with httpx.AsyncClient(timeout=10) as client:
+        url = f"{self.KROGER_API_BASE_URL}products"
+
+        async with http_client.session() as client:
             try:
-                response = await client.get(
-                    f"{self.KROGER_API_BASE_URL}products",
-                    headers={"Authorization": f"Bearer {token}"},
-                    params={
-                        "filter.term": self.keyword,
-                        "filter.locationId": self.location_id,
-                        "filter.start": self.start,
-                        "filter.limit": self.limit,
-                    },
-                )
+                for attempt in range(Config.HTTP_MAX_RETRIES + 1):
+                    async with rate_limiter.limit(url):
+                        response = await client.get(
+                            url,
+                            headers={"Authorization": f"Bearer {token}"},
+                            params={
+                                "filter.term": self.keyword,
+                                "filter.locationId": self.location_id,
+                                "filter.start": start,
+                                "filter.limit": self.limit,
+                            },
+                        )
+
+                    # Throttled: pause the whole host for as long as Kroger asks, then retry
+                    if response.status_code == 429 and attempt < Config.HTTP_MAX_RETRIES:
+                        rate_limiter.backoff(url, response.headers.get("Retry-After"), attempt)
+                        continue
+                    break
 
                 if response.status_code != 200:
                     logger.error(f"Failed to fetch products: {response.text}")
@@ -115,10 +237,55 @@ class KrogerAPIClient:
                 logger.error(f"Request error while fetching products: {e}")
                 raise Exception(f"Request error while fetching products: {e}")
 
-    async def fetch_all_products_with_pagination(self):
-        """Fetches products from the Kroger API using asynchronous pagination."""
+    def _filter_new_products(self, products: list) -> list:
+        """Returns products that have not been seen yet, keeping their order."""
+        new_products = []
+        for product in products:
+            if product["productId"] not in self.seen_product_ids:
+                new_products.append(product)
+                self.seen_product_ids.add(product["productId"])
+        return new_products
+
+    @staticmethod
+    def _get_total(response_data: dict) -> int | None:
+        """Returns the total number of products reported by the API, if present."""
+        if "meta" in response_data and "pagination" in response_data["meta"]:
+            return response_data["meta"]["pagination"].get("total", 0)
+        return None
+
+    async def _iter_pages_concurrently(self, offsets: list):
+        """Fetches the pages at the given offsets concurrently, yielding them in offset order."""
+        semaphore = asyncio.Semaphore(Config.KROGER_API_PAGE_CONCURRENCY)
+
+        async def get_page(start: int):
+            async with semaphore:
+                return await self._get_products(start)
+
+        tasks = [asyncio.create_task(get_page(start)) for start in offsets]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            # The consumer stopped early or a page failed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def iter_product_pages(self, parallel: bool = None):
+        """
+        Fetches products from the Kroger API page by page, yielding each page as soon as it arrives.
+
+        Only products that have not been seen yet are yielded and nothing is accumulated,
+        so the caller decides how many pages to keep in memory.
+
+        :param parallel: Fetch the remaining pages concurrently once the first page reports the total.
+                         Defaults to Config.KROGER_API_PARALLEL_PAGINATION.
+        """
+        if parallel is None:
+            parallel = Config.KROGER_API_PARALLEL_PAGINATION
+
         while True:
-            if self.start > 250:
+            if self.start > self.MAX_START:
                 break
 
             response_data = await self._get_products()
@@ -128,18 +295,37 @@ class KrogerAPIClient:
                 logger.info("No more products found, stopping pagination.")
                 break
 
-            for product in products:
-                if product["productId"] not in self.seen_product_ids:
-                    self.all_products.append(product)
-                    self.seen_product_ids.add(product["productId"])
+            new_products = self._filter_new_products(products)
+            if new_products:
+                yield new_products
 
             # Increase offset
             self.start += self.limit
 
-            if "meta" in response_data and "pagination" in response_data["meta"]:
-                total = response_data["meta"]["pagination"].get("total", 0)
+            total = self._get_total(response_data)
+            if total is not None:
                 if self.start >= total:
                     break
 
+                if parallel:
+                    # The total tells us every remaining offset, so there is no need to walk them one by one
+                    offsets = [start for start in range(self.start, self.MAX_START + 1, self.limit) if start < total]
+                    async for page in self._iter_pages_concurrently(offsets):
+                        new_products = self._filter_new_products(page.get("data", []))
+                        if new_products:
+                            yield new_products
+                    self.start = offsets[-1] + self.limit if offsets else self.start
+                    break
+
+    async def fetch_all_products_with_pagination(self, parallel: bool = None):
+        """
+        Fetches products from the Kroger API using asynchronous pagination.
+
+        :param parallel: Fetch the remaining pages concurrently once the first page reports the total.
+                         Defaults to Config.KROGER_API_PARALLEL_PAGINATION.
+        """
+        async for page in self.iter_product_pages(parallel):
+            self.all_products.extend(page)
+
         logger.info(f"Total products retrieved: {len(self.all_products)}")
         return self.all_products
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, UTC
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class TokenBucket:
+    """Token bucket that lets `rate` requests per second through, with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        # Set when the upstream asked us to back off (429 + Retry-After)
+        self.blocked_until = 0.0
+
+    async def acquire(self):
+        """Waits until a token is available and takes it."""
+        # Honor an upstream back-off before taking a token
+        delay = self.blocked_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        # Reserve the token right away so concurrent callers queue up behind each other
+        self.tokens -= 1
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+    def pause(self, delay: float):
+        """Blocks the bucket for `delay` seconds."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+
+class HostRateLimiter:
+    """Per-host rate limiting: a token bucket and an in-flight cap for every upstream host."""
+
+    def __init__(self, rate: float, burst: float, max_in_flight: int, overrides: dict = None):
+        """
+        :param rate: Default requests per second for a host.
+        :param burst: Default bucket capacity for a host.
+        :param max_in_flight: Max concurrent requests to a single host.
+        :param overrides: Requests per second keyed by host name.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.overrides = overrides or {}
+        self._buckets = {}
+        self._semaphores = {}
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return httpx.URL(url).host
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.overrides.get(host, self.rate), self.burst)
+        return self._buckets[host]
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphores[host]
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        """Holds an in-flight slot and a rate token for the host of `url`."""
+        host = self._host(url)
+        async with self._semaphore(host):
+            await self._bucket(host).acquire()
+            yield
+
+    def backoff(self, url: str, retry_after: str | None, attempt: int) -> float:
+        """
+        Pauses the host of `url` after a 429 response.
+
+        :param url: Requested URL.
+        :param retry_after: Value of the Retry-After header, if any.
+        :param attempt: Zero-based retry attempt, used for exponential back-off without Retry-After.
+        :return: Delay in seconds.
+        """
+        delay = self.parse_retry_after(retry_after)
+        if delay is None:
+            delay = min(2 ** attempt, 60)
+
+        host = self._host(url)
+        logger.warning(f"Rate limited by {host}, pausing requests for {delay:.1f} sec.")
+        self._bucket(host).pause(delay)
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        """Parses Retry-After given either as seconds or as an HTTP date."""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=UTC)
+        return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+rate_limiter = HostRateLimiter(
+    rate=Config.HTTP_RATE_LIMIT_PER_SECOND,
+    burst=Config.HTTP_RATE_LIMIT_BURST,
+    max_in_flight=Config.HTTP_MAX_IN_FLIGHT_PER_HOST,
+    overrides=Config.HTTP_RATE_LIMIT_OVERRIDES,
+)
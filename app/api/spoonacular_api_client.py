@@ -1,6 +1,8 @@
 import httpx
-import asyncio
 
+from app.api.api_key_pool import ApiKeyPool, NoApiKeyAvailable
+from app.api.http_client import http_client
+from app.api.rate_limiter import rate_limiter
 from app.config.config import Config
 from app.config.logger_config import LoggerConfig
 
@@ -12,45 +14,62 @@ class SpoonacularAPIClient:
     """Client for interacting with the Spoonacular API."""
 
     SPOONACULAR_API_BASE_URL = Config.SPOONACULAR_API_BASE_URL
-    SPOONACULAR_API_KEYS = Config.SPOONACULAR_API_KEYS
-    _current_key_index = 0
-
-    async def _get_random_recipe(self):
-        """Fetches random recipes asynchronously from the Spoonacular API."""
-        for _ in range(len(self.SPOONACULAR_API_KEYS)):
-            api_key = self.SPOONACULAR_API_KEYS[self._current_key_index]
-
-            async with httpx.AsyncClient(timeout=10) as client:
-                try:
-                    response = await client.get(
-                        f"{self.SPOONACULAR_API_BASE_URL}/recipes/random",
-                        params={
-                            "apiKey": api_key,
-                            # the number can be from 1 to 100 (inclusive)
-                            "number": 1,
-                        },
-                    )
-
-                    if response.status_code in [402, 429]:
-                        logger.warning(f"API key {api_key} exceeded rate limit. Trying another key.")
-                        self._switch_api_key()
-                        await asyncio.sleep(2)
-                        continue
-
-                    response.raise_for_status()
-                    return response.json()
-
-                except httpx.HTTPError as e:
-                    logger.error(f"Request error while fetching recipes: {e}")
-                    raise Exception(f"Request error while fetching recipes: {e}")
+    # Shared by all clients, so concurrent callers see each other's quota
+    key_pool = ApiKeyPool(Config.SPOONACULAR_API_KEYS)
+
+    async def _get_random_recipe(self, number: int = None):
+        """
+        Fetches random recipes asynchronously from the Spoonacular API.
+
+        :param number: Recipes per call, from 1 to 100. Defaults to Config.SPOONACULAR_RECIPES_PER_CALL.
+        """
+        number = min(max(number or Config.SPOONACULAR_RECIPES_PER_CALL, 1), 100)
+        url = f"{self.SPOONACULAR_API_BASE_URL}/recipes/random"
+
+        # Every attempt uses another key: an exhausted key goes on cooldown and is not picked again
+        for _ in range(len(self.key_pool)):
+            try:
+                api_key = self.key_pool.acquire()
+            except NoApiKeyAvailable as e:
+                logger.error(f"All API keys have exceeded their limits: {self.key_pool.snapshot()}")
+                raise Exception(f"No valid API key available. {e}")
+
+            response = None
+            try:
+                async with http_client.session() as client:
+                    async with rate_limiter.limit(url):
+                        response = await client.get(
+                            url,
+                            params={
+                                "apiKey": api_key,
+                                # the number can be from 1 to 100 (inclusive)
+                                "number": number,
+                            },
+                        )
+            except httpx.HTTPError as e:
+                logger.error(f"Request error while fetching recipes: {e}")
+                raise Exception(f"Request error while fetching recipes: {e}")
+            finally:
+                self.key_pool.release(
+                    api_key,
+                    response.status_code if response is not None else None,
+                    response.headers if response is not None else None,
+                )
+
+            if response.status_code in [402, 429]:
+                logger.warning(f"API key {ApiKeyPool.mask(api_key)} exceeded its limit. Trying another key.")
+                continue
+
+            try:
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"Request error while fetching recipes: {e}")
+                raise Exception(f"Request error while fetching recipes: {e}")
+            return response.json()
 
         logger.error("All API keys have exceeded their limits or failed.")
         raise Exception("No valid API key available.")
 
-    def _switch_api_key(self):
-        """Switches to the next available API key."""
-        self._current_key_index = (self._current_key_index + 1) % len(self.SPOONACULAR_API_KEYS)
-
-    def fetch_random_recipe(self):
-        """Fetches a random recipe using the external function."""
-        return self._get_random_recipe()
+    def fetch_random_recipe(self, number: int = None):
+        """Fetches random recipes using the external function."""
+        return self._get_random_recipe(number)
@@ -14,15 +14,129 @@ class Config:
     MONGO_URL = os.getenv("MONGO_URL")
     MONGO_DB_NAME = os.getenv("MONGO_DB_NAME")
     MONGO_COLLECTION_NAME = os.getenv("MONGO_COLLECTION_NAME")
+    # Connection pool; MONGO_COMPRESSORS e.g. "zstd,zlib" (zstd and snappy need extra packages)
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE") or "100")
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE") or "0")
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS") or "0")
+    MONGO_COMPRESSORS = [item.strip() for item in (os.getenv("MONGO_COMPRESSORS") or "").split(",") if item.strip()]
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS") or "3000")
+    # Background liveness check (GET /health): seconds between pings, failed pings in a row before
+    # MongoDB is reported unhealthy. The driver reconnects by itself once MongoDB is back
+    MONGO_HEALTH_CHECK_INTERVAL = float(os.getenv("MONGO_HEALTH_CHECK_INTERVAL") or "30")
+    MONGO_HEALTH_FAILURE_THRESHOLD = int(os.getenv("MONGO_HEALTH_FAILURE_THRESHOLD") or "3")
+    MONGO_JOBS_COLLECTION_NAME = os.getenv("MONGO_JOBS_COLLECTION_NAME") or "scrape_jobs"
+    MONGO_PRICE_HISTORY_COLLECTION_NAME = (os.getenv("MONGO_PRICE_HISTORY_COLLECTION_NAME")
+                                           or f"{MONGO_COLLECTION_NAME}_price_history")
+    # Min/median/max/avg price per (ingredient, store), refreshed for the ingredients each scrape touches
+    MONGO_PRICE_SUMMARY_COLLECTION_NAME = (os.getenv("MONGO_PRICE_SUMMARY_COLLECTION_NAME")
+                                           or "ingredient_price_summary")
 
     KROGER_API_BASE_URL = os.getenv("KROGER_API_BASE_URL")
     KROGER_API_TOKEN_URL = os.getenv("KROGER_API_TOKEN_URL")
     KROGER_API_CLIENT_ID = os.getenv("KROGER_API_CLIENT_ID")
     KROGER_API_CLIENT_SECRET = os.getenv("KROGER_API_CLIENT_SECRET")
-    KROGER_API_LOCATION_ID = os.getenv("KROGER_API_LOCATION_ID")
+    # Stores scraped in one run, e.g. "03400128,70100023" (see app/scripts/find_shop.py);
+    # defaults to the single KROGER_API_LOCATION_ID
+    KROGER_API_LOCATION_IDS = [
+        location_id.strip()
+        for location_id in (os.getenv("KROGER_API_LOCATION_IDS") or os.getenv("KROGER_API_LOCATION_ID") or "").split(",")
+        if location_id.strip()
+    ]
+    KROGER_API_LOCATION_ID = os.getenv("KROGER_API_LOCATION_ID") or next(iter(KROGER_API_LOCATION_IDS), None)
+    # Fetch the remaining pages concurrently once the first page reports the total
+    KROGER_API_PARALLEL_PAGINATION = os.getenv("KROGER_API_PARALLEL_PAGINATION", "true").lower() in ("1", "true", "yes")
+    KROGER_API_PAGE_CONCURRENCY = int(os.getenv("KROGER_API_PAGE_CONCURRENCY", "4"))
+    # The token is refreshed in the background this many seconds before it expires
+    KROGER_TOKEN_REFRESH_MARGIN = int(os.getenv("KROGER_TOKEN_REFRESH_MARGIN") or "300")
+    # "memory" keeps the token per process, "mongo" shares it between API workers and scrape runs
+    KROGER_TOKEN_STORE = os.getenv("KROGER_TOKEN_STORE") or "memory"
+    MONGO_TOKENS_COLLECTION_NAME = os.getenv("MONGO_TOKENS_COLLECTION_NAME") or "api_tokens"
 
     SPOONACULAR_API_BASE_URL = os.getenv("SPOONACULAR_API_BASE_URL", "https://api.spoonacular.com/")
     SPOONACULAR_API_KEYS = [key.strip() for key in (os.getenv("SPOONACULAR_API_KEYS") or "").split(",") if key.strip()]
+    # Recipes requested per call (1 to 100); every call costs about the same quota
+    SPOONACULAR_RECIPES_PER_CALL = min(max(int(os.getenv("SPOONACULAR_RECIPES_PER_CALL") or "100"), 1), 100)
+
+    # Shared HTTP client (connection pool)
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    # HTTP/2 requires the optional 'h2' package (pip install "httpx[http2]")
+    HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+
+    # Per-host rate limiting and retries
+    HTTP_RATE_LIMIT_PER_SECOND = float(os.getenv("HTTP_RATE_LIMIT_PER_SECOND", "10"))
+    HTTP_RATE_LIMIT_BURST = float(os.getenv("HTTP_RATE_LIMIT_BURST", "10"))
+    # Requests per second for specific hosts, e.g. "api.kroger.com=5,api.spoonacular.com=1"
+    HTTP_RATE_LIMIT_OVERRIDES = {
+        host.strip(): float(rate)
+        for host, _, rate in (item.partition("=") for item in (os.getenv("HTTP_RATE_LIMIT_OVERRIDES") or "").split(","))
+        if host.strip() and rate.strip()
+    }
+    HTTP_MAX_IN_FLIGHT_PER_HOST = int(os.getenv("HTTP_MAX_IN_FLIGHT_PER_HOST", "10"))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+
+    # WebSocket log streaming: lines kept per client (oldest dropped first) and batching interval
+    WS_LOG_QUEUE_SIZE = int(os.getenv("WS_LOG_QUEUE_SIZE", "1000"))
+    WS_LOG_FLUSH_INTERVAL = float(os.getenv("WS_LOG_FLUSH_INTERVAL", "0.1"))
+    WS_LOG_SEND_TIMEOUT = float(os.getenv("WS_LOG_SEND_TIMEOUT", "5"))
+    # Recent lines kept in memory, and how many of them a new client receives on connect
+    WS_LOG_HISTORY_SIZE = int(os.getenv("WS_LOG_HISTORY_SIZE", "500"))
+    WS_LOG_REPLAY_LINES = int(os.getenv("WS_LOG_REPLAY_LINES", "100"))
+
+    # Read endpoints (products, price summaries) keep up to this many responses in memory for this many
+    # seconds; writes for an ingredient drop its responses early. A TTL of 0 disables the cache
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES") or "1024")
+    RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS") or "60")
+
+    # A running job that has not reported progress for this long is considered dead
+    JOB_STALE_AFTER_SECONDS = int(os.getenv("JOB_STALE_AFTER_SECONDS", "3600"))
+
+    # Number of ingredients scraped at the same time
+    SCRAPER_MAX_CONCURRENCY = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "5"))
+
+    # An (ingredient, store) pair fully scraped less than this many seconds ago is fresh (0 disables):
+    # "sample" fetches only its first page and re-scrapes if that page changed, "skip" does not fetch it at all
+    MONGO_FRESHNESS_COLLECTION_NAME = os.getenv("MONGO_FRESHNESS_COLLECTION_NAME") or "scrape_freshness"
+    SCRAPE_FRESHNESS_TTL_SECONDS = int(os.getenv("SCRAPE_FRESHNESS_TTL_SECONDS") or "43200")
+    SCRAPE_FRESH_MODE = os.getenv("SCRAPE_FRESH_MODE") or "sample"
+
+    # Where a scrape gets its ingredients: "frontier" adds the ingredients of new random recipes
+    # to a persistent frontier and scrapes the SCRAPE_FRONTIER_BATCH_SIZE scraped longest ago,
+    # "recipes" scrapes exactly the ingredients of the new recipes
+    SCRAPE_INGREDIENT_SOURCE = os.getenv("SCRAPE_INGREDIENT_SOURCE") or "frontier"
+    SCRAPE_FRONTIER_BATCH_SIZE = int(os.getenv("SCRAPE_FRONTIER_BATCH_SIZE") or "50")
+    MONGO_INGREDIENT_FRONTIER_COLLECTION_NAME = (os.getenv("MONGO_INGREDIENT_FRONTIER_COLLECTION_NAME")
+                                                 or "ingredient_frontier")
+
+    # Ingredient matching (needs the heavy dependencies: sentence-transformers, faiss-cpu)
+    MATCHING_ENABLED = os.getenv("MATCHING_ENABLED", "false").lower() in ("1", "true", "yes")
+    MATCHING_MODEL_NAME = os.getenv("MATCHING_MODEL_NAME") or "all-MiniLM-L6-v2"
+    MONGO_INGREDIENTS_COLLECTION_NAME = os.getenv("MONGO_INGREDIENTS_COLLECTION_NAME") or "ingredients_cache"
+    MONGO_DESCRIPTION_CACHE_COLLECTION_NAME = os.getenv("MONGO_DESCRIPTION_CACHE_COLLECTION_NAME") or "description_cache"
+    MONGO_MATCH_REVIEW_COLLECTION_NAME = os.getenv("MONGO_MATCH_REVIEW_COLLECTION_NAME") or "ingredient_match_review"
+    MONGO_UPDATE_CHECKPOINTS_COLLECTION_NAME = (os.getenv("MONGO_UPDATE_CHECKPOINTS_COLLECTION_NAME")
+                                                or "ingredient_update_checkpoints")
+    # Ingredient vectors and the FAISS index are cached here between runs
+    INGREDIENT_INDEX_CACHE_DIR = os.getenv("INGREDIENT_INDEX_CACHE_DIR") or ".cache/ingredient_index"
+    # FAISS index: "flat" (exact), "ivf" or "hnsw" (approximate, see app/scripts/benchmark_index.py);
+    # metric "l2" or "ip" (cosine similarity on normalized vectors)
+    INGREDIENT_INDEX_TYPE = os.getenv("INGREDIENT_INDEX_TYPE") or "flat"
+    INGREDIENT_INDEX_METRIC = os.getenv("INGREDIENT_INDEX_METRIC") or "l2"
+    INGREDIENT_INDEX_NPROBE = int(os.getenv("INGREDIENT_INDEX_NPROBE") or "8")
+    INGREDIENT_INDEX_HNSW_M = int(os.getenv("INGREDIENT_INDEX_HNSW_M") or "32")
+    INGREDIENT_INDEX_EF_SEARCH = int(os.getenv("INGREDIENT_INDEX_EF_SEARCH") or "64")
+    # Product description embeddings and matches kept in memory / in MongoDB (days unused before expiry)
+    DESCRIPTION_CACHE_SIZE = int(os.getenv("DESCRIPTION_CACHE_SIZE") or "100000")
+    DESCRIPTION_CACHE_TTL_DAYS = int(os.getenv("DESCRIPTION_CACHE_TTL_DAYS") or "30")
+    # Candidates kept per description, and the cosine similarity the best one needs to be accepted
+    MATCH_TOP_K = int(os.getenv("MATCH_TOP_K") or "3")
+    MATCH_MIN_SCORE = float(os.getenv("MATCH_MIN_SCORE") or "0.5")
+    # Concurrent /match requests are merged into one model call of up to this many descriptions,
+    # waiting at most this long (seconds) for more requests to join
+    MATCHING_MAX_BATCH_SIZE = int(os.getenv("MATCHING_MAX_BATCH_SIZE") or "256")
+    MATCHING_MAX_BATCH_WAIT = float(os.getenv("MATCHING_MAX_BATCH_WAIT") or "0.01")
 
     REQUIRED_VARS = {
         "MONGO_URL": MONGO_URL,
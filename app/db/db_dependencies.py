@@ -5,5 +5,4 @@ from app.db.mongo_db import mongodb_client
 
 
 async def get_mongo_database() -> AsyncIOMotorDatabase:
-    client = await mongodb_client.get_client()
-    return client[Config.MONGO_DB_NAME]
\ No newline at end of file
+    return mongodb_client.get_client()[Config.MONGO_DB_NAME]
\ No newline at end of file
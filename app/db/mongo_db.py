@@ -1,3 +1,5 @@
+import asyncio
+
 from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.config.config import Config
@@ -14,40 +16,86 @@ class MongoDBClient:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.client = None
+            cls._instance.is_healthy = True
+            cls._instance._monitor_task = None
         return cls._instance
 
     def __init__(self):
         if not hasattr(self, 'client'):
             self.client = None
 
+    @staticmethod
+    def _create_client(**overrides) -> AsyncIOMotorClient:
+        """ Creates a client with the pool settings from Config (no I/O: connections are opened lazily) """
+        options = {
+            "serverSelectionTimeoutMS": Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "maxPoolSize": Config.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": Config.MONGO_MIN_POOL_SIZE,
+        }
+        if Config.MONGO_MAX_IDLE_TIME_MS:
+            options["maxIdleTimeMS"] = Config.MONGO_MAX_IDLE_TIME_MS
+        if Config.MONGO_COMPRESSORS:
+            options["compressors"] = Config.MONGO_COMPRESSORS
+        options.update(overrides)
+        return AsyncIOMotorClient(Config.MONGO_URL, **options)
+
     async def connect(self) -> None:
-        """ Initialize the MongoDB connection if not already connected or lost """
+        """ Initialize the MongoDB connection if not already connected """
         if self.client is None:
-            self.client = AsyncIOMotorClient(
-                Config.MONGO_URL,
-                serverSelectionTimeoutMS=3000
-            )
+            self.client = self._create_client()
             logger.info("Connected to MongoDB")
-        else:
+
+    def get_client(self) -> AsyncIOMotorClient:
+        """ Returns the MongoDB client without any network round trip; liveness is checked by the monitor """
+        if self.client is None:
+            self.client = self._create_client()
+        return self.client
+
+    def start_monitor(self, interval: float = None, failure_threshold: int = None) -> None:
+        """
+        Starts pinging MongoDB in the background to keep is_healthy up to date.
+
+        The client is never replaced: the driver reconnects by itself, and repositories and
+        running jobs keep using the database handles they already hold.
+
+        :param interval: Seconds between pings, defaults to Config.MONGO_HEALTH_CHECK_INTERVAL.
+        :param failure_threshold: Consecutive failed pings before MongoDB is reported unhealthy,
+                                  defaults to Config.MONGO_HEALTH_FAILURE_THRESHOLD.
+        """
+        if self._monitor_task is None:
+            self._monitor_task = asyncio.create_task(self._monitor(
+                interval or Config.MONGO_HEALTH_CHECK_INTERVAL,
+                failure_threshold or Config.MONGO_HEALTH_FAILURE_THRESHOLD,
+            ))
+
+    async def stop_monitor(self) -> None:
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            await asyncio.gather(self._monitor_task, return_exceptions=True)
+            self._monitor_task = None
+
+    async def _monitor(self, interval: float, failure_threshold: int) -> None:
+        failures = 0
+        while True:
+            await asyncio.sleep(interval)
             try:
-                await self.client.admin.command('ping')
+                await self.get_client().admin.command('ping')
             except Exception as e:
-                logger.error(f"MongoDB connection lost: {e}. Reconnecting...")
-                self.client.close()
-                self.client = AsyncIOMotorClient(
-                    Config.MONGO_URL,
-                    serverSelectionTimeoutMS=3000,
-                    retryWrites=False
-                )
-                logger.info("Reconnected to MongoDB")
-
-    async def get_client(self) -> AsyncIOMotorClient:
-        """ Returns the MongoDB client """
-        await self.connect()
-        return self.client
+                failures += 1
+                logger.error(f"MongoDB ping failed ({failures}/{failure_threshold}): {e}")
+                if failures >= failure_threshold and self.is_healthy:
+                    logger.error("MongoDB is unreachable")
+                    self.is_healthy = False
+                continue
+
+            if not self.is_healthy:
+                logger.info("MongoDB connection restored")
+            self.is_healthy = True
+            failures = 0
 
     async def close(self) -> None:
         """ Close the MongoDB connection """
+        await self.stop_monitor()
         if self.client:
             try:
                 self.client.close()
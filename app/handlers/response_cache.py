@@ -0,0 +1,124 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.config.config import Config
+
+
+class ResponseCache:
+    """
+    JSON responses of read endpoints, kept in memory and tagged with the ingredient they depend on.
+
+    Entries expire after ttl seconds and the least recently used ones are evicted beyond max_entries.
+    Writes for an ingredient drop its entries and those not scoped to one ingredient, so cached data is
+    never older than the last write in this process; other processes (scrape.py) are bounded by the TTL.
+    Every response carries an ETag, and a request whose If-None-Match still matches gets an empty 304.
+    """
+
+    # Tag of responses that may include any ingredient (no ingredient filter)
+    ANY_INGREDIENT = "*"
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60):
+        """
+        :param max_entries: Max responses kept.
+        :param ttl: Seconds a response is served from memory, 0 disables caching (ETags still work).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._keys_by_tag = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(request: Request) -> str:
+        """Identifies a response by path and query, whatever the order of the query parameters."""
+        return f"{request.url.path}?{'&'.join(sorted(f'{k}={v}' for k, v in request.query_params.multi_items()))}"
+
+    @staticmethod
+    def etag(body: bytes) -> str:
+        return f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+    @staticmethod
+    def etag_matches(if_none_match: str | None, etag: str) -> bool:
+        if not if_none_match:
+            return False
+        candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    def get(self, key: str) -> tuple | None:
+        """Returns the (body, etag) of a live entry, None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None or entry["expires_at"] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["body"], entry["etag"]
+
+    def put(self, key: str, body: bytes, etag: str, ingredient_name: str = None) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        if key in self._entries:
+            self._remove(key)
+        tag = ingredient_name or self.ANY_INGREDIENT
+        self._entries[key] = {"body": body, "etag": etag, "tag": tag, "expires_at": time.monotonic() + self.ttl}
+        self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        keys = self._keys_by_tag.get(entry["tag"])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[entry["tag"]]
+
+    def invalidate(self, ingredient_name: str = None) -> None:
+        """Drops the responses that may include the ingredient; everything if no ingredient is given."""
+        if ingredient_name is None:
+            self.clear()
+            return
+        for tag in (ingredient_name, self.ANY_INGREDIENT):
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    async def respond(self, request: Request, produce: Callable[[], Awaitable], ingredient_name: str = None) -> Response:
+        """
+        Serves a JSON response from the cache, producing (and caching) it on a miss.
+
+        :param request: The incoming request; its path and query identify the response.
+        :param produce: Coroutine function returning the response content.
+        :param ingredient_name: The ingredient the response is limited to, None if it may include any.
+        """
+        key = self.key(request)
+        cached = self.get(key)
+        if cached is None:
+            body = json.dumps(jsonable_encoder(await produce()), separators=(",", ":")).encode()
+            cached = body, self.etag(body)
+            self.put(key, *cached, ingredient_name=ingredient_name)
+        body, etag = cached
+
+        # Clients revalidate every time; an unchanged response costs an empty 304
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if self.etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache(Config.RESPONSE_CACHE_MAX_ENTRIES, Config.RESPONSE_CACHE_TTL_SECONDS)
@@ -1,21 +1,124 @@
 import asyncio
 import logging
-from fastapi import WebSocket
-from typing import List
+import threading
+from collections import deque
+
+
+class LogSubscription:
+    """A log subscriber (one WebSocket) with its own filters and bounded queue of pending lines."""
+
+    def __init__(self, queue_size: int, flush_interval: float, min_level: int = logging.NOTSET,
+                 ingredient: str = None):
+        # When full, appending drops the oldest line, so a slow client only loses its own backlog
+        self.pending = deque(maxlen=queue_size)
+        self.flush_interval = flush_interval
+        self.min_level = min_level
+        self.ingredient = ingredient.lower() if ingredient else None
+        self._ready = asyncio.Event()
+
+    def matches(self, levelno: int, message: str) -> bool:
+        if levelno < self.min_level:
+            return False
+        return self.ingredient is None or self.ingredient in message.lower()
+
+    def push(self, message: str):
+        self.pending.append(message)
+        self._ready.set()
+
+    async def next_batch(self) -> str:
+        """Waits for new lines and returns them as one newline-joined batch."""
+        await self._ready.wait()
+        # Let lines logged in the same burst pile up, then send them in one frame
+        await asyncio.sleep(self.flush_interval)
+        self._ready.clear()
+        batch = "\n".join(self.pending)
+        self.pending.clear()
+        return batch
+
+
+class LogBroadcaster:
+    """
+    Fans log lines out to subscribers and keeps the most recent ones for replay.
+
+    Publishing only appends to bounded queues; subscribers send at their own pace,
+    so one slow browser never delays the others or the code that logs.
+    """
+
+    def __init__(self):
+        self.subscriptions: set[LogSubscription] = set()
+        self.queue_size = 1000
+        self.flush_interval = 0.1
+        self.history = deque(maxlen=500)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop is not None
+
+    def start(self, queue_size: int = None, flush_interval: float = None, history_size: int = None):
+        """Binds the broadcaster to the running event loop."""
+        self.queue_size = queue_size or self.queue_size
+        self.flush_interval = flush_interval or self.flush_interval
+        if history_size:
+            self.history = deque(self.history, maxlen=history_size)
+        self._loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+
+    async def stop(self):
+        """Stops accepting lines; lines published afterwards are dropped."""
+        self._loop = None
+
+    def subscribe(self, min_level: int = logging.NOTSET, ingredient: str = None, replay: int = 0) -> LogSubscription:
+        """
+        Registers a subscriber.
+
+        :param min_level: Lowest log level to deliver.
+        :param ingredient: Only deliver lines mentioning this ingredient.
+        :param replay: Number of recent matching lines to deliver right away.
+        """
+        subscription = LogSubscription(self.queue_size, self.flush_interval, min_level, ingredient)
+        if replay > 0:
+            recent = [message for levelno, message in self.history if subscription.matches(levelno, message)]
+            for message in recent[-replay:]:
+                subscription.push(message)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LogSubscription):
+        self.subscriptions.discard(subscription)
+
+    def publish(self, message: str, levelno: int = logging.INFO):
+        """Queues a line for every matching subscriber. Must be called on the event loop thread."""
+        self.history.append((levelno, message))
+        for subscription in self.subscriptions:
+            if subscription.matches(levelno, message):
+                subscription.push(message)
+
+    def publish_threadsafe(self, message: str, levelno: int = logging.INFO):
+        """Queues a line for every matching subscriber from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        if threading.get_ident() == self._thread_id:
+            self.publish(message, levelno)
+        else:
+            loop.call_soon_threadsafe(self.publish, message, levelno)
+
+
+log_broadcaster = LogBroadcaster()
 
-connected_websockets: List[WebSocket] = []
 
 class WebSocketLogHandler(logging.Handler):
     def __init__(self):
         super().__init__()
 
-    async def send_to_websockets(self, message: str):
-        for ws in connected_websockets:
-            try:
-                await ws.send_text(message)
-            except Exception as e:
-                print(f"WebSocket error: {e}")
-
     def emit(self, record: logging.LogRecord):
-        message = self.format(record)
-        asyncio.create_task(self.send_to_websockets(message))
+        # Not serving WebSockets (tests, scripts): skip formatting altogether
+        if not log_broadcaster.is_running:
+            return
+        try:
+            message = self.format(record)
+            log_broadcaster.publish_threadsafe(message, record.levelno)
+        except Exception:
+            self.handleError(record)
@@ -3,17 +3,56 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from app.api.http_client import http_client
+from app.api.kroger_api_client import KrogerAPIClient
+from app.routers.health_router import router as health_router
 from app.routers.logs_router import router as logs_router
+from app.config.config import Config
+from app.db.db_dependencies import get_mongo_database
 from app.db.mongo_db import mongodb_client
+from app.handlers.web_socket_handler import log_broadcaster
+from app.repositories.freshness_repository import FreshnessRepository
+from app.repositories.ingredient_frontier_repository import IngredientFrontierRepository
+from app.repositories.job_repository import JobRepository
+from app.repositories.mongo_repository import MongoRepository
+from app.repositories.price_summary_repository import PriceSummaryRepository
+from app.repositories.token_repository import TokenRepository
 
+from app.routers.match_router import router as match_router
+from app.routers.products_router import router as products_router
 from app.routers.scrap_router import router
+from app.services.job_service import JobService
+from app.services.matching_service import matching_service
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    log_broadcaster.start(
+        queue_size=Config.WS_LOG_QUEUE_SIZE,
+        flush_interval=Config.WS_LOG_FLUSH_INTERVAL,
+        history_size=Config.WS_LOG_HISTORY_SIZE,
+    )
     await mongodb_client.connect()
+    # Liveness is checked in the background instead of on every request
+    mongodb_client.start_monitor()
+    db = await get_mongo_database()
+    await MongoRepository(db).ensure_indexes()
+    await JobRepository(db).ensure_indexes()
+    await FreshnessRepository(db).ensure_indexes()
+    await IngredientFrontierRepository(db).ensure_indexes()
+    await PriceSummaryRepository(db).ensure_indexes()
+    if Config.KROGER_TOKEN_STORE == "mongo":
+        # Every worker uses the same Kroger token instead of minting its own
+        KrogerAPIClient.use_token_store(TokenRepository(db))
+    await http_client.start()
+    # Keeps the model and the index warm for /match (no-op unless MATCHING_ENABLED)
+    await matching_service.load(db)
     yield
+    await JobService.cancel_running_jobs()
+    await matching_service.stop()
+    await http_client.close()
     await mongodb_client.close()
+    await log_broadcaster.stop()
 
 app = FastAPI(title="Ingredient Price API", lifespan=lifespan)
 
@@ -26,4 +65,7 @@ app.add_middleware(
 )
 
 app.include_router(router, prefix="/api/v1")
+app.include_router(match_router, prefix="/api/v1")
+app.include_router(products_router, prefix="/api/v1")
 app.include_router(logs_router, prefix="/ws")
+app.include_router(health_router)
@@ -0,0 +1,126 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, UTC
+
+import numpy as np
+from bson import Binary
+from pymongo import ASCENDING, UpdateOne
+
+
+class DescriptionCache:
+    """
+    Content-addressed cache of product description embeddings and their ingredient matches.
+
+    Entries are keyed by a hash of (model name, normalized description). A bounded in-memory
+    LRU sits in front of an optional MongoDB collection whose entries expire when unused.
+    Matches are stored with the hash of the ingredient list they were made against, so
+    changing the ingredient list only invalidates the match, not the (expensive) vector.
+    """
+
+    def __init__(self, model_name: str, collection=None, max_size: int = 100_000, ttl_days: int = 30):
+        """
+        :param model_name: Embedding model name, part of the key.
+        :param collection: Optional pymongo collection persisting entries between runs.
+        :param max_size: Max entries kept in memory.
+        :param ttl_days: Days an unused entry is kept in MongoDB.
+        """
+        self.model_name = model_name
+        self.collection = collection
+        self.max_size = max_size
+        self.ttl_days = ttl_days
+        self._entries = OrderedDict()
+        # Pipeline stages read and write the cache from different threads
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def ensure_indexes(self) -> None:
+        if self.collection is not None:
+            self.collection.create_index(
+                [("last_used_at", ASCENDING)],
+                name="last_used_at_ttl",
+                expireAfterSeconds=self.ttl_days * 24 * 3600,
+            )
+
+    @staticmethod
+    def normalize(description: str) -> str:
+        return re.sub(r"\s+", " ", description).strip().lower()
+
+    def key(self, description: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\0{self.normalize(description)}".encode()).hexdigest()
+
+    def _remember(self, key: str, entry: dict) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Looks up entries by key.
+
+        :return: Entries ({"vector", "match", "index_hash"}) keyed by the keys that were found.
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                else:
+                    missing.append(key)
+
+        if missing and self.collection is not None:
+            loaded = []
+            for doc in self.collection.find({"_id": {"$in": missing}}):
+                entry = {
+                    "vector": np.frombuffer(doc["vector"], dtype=np.float32),
+                    "match": doc.get("match"),
+                    "index_hash": doc.get("index_hash"),
+                }
+                found[doc["_id"]] = entry
+                loaded.append(doc["_id"])
+            with self._lock:
+                for key in loaded:
+                    self._remember(key, found[key])
+            if loaded:
+                # Keeps entries that are still in use from expiring
+                self.collection.update_many({"_id": {"$in": loaded}}, {"$set": {"last_used_at": datetime.now(UTC)}})
+
+        with self._lock:
+            self.stats["hits"] += len(found)
+            self.stats["misses"] += len(dict.fromkeys(keys)) - len(found)
+        return found
+
+    def put_many(self, entries: dict) -> None:
+        """
+        Stores entries keyed by description key and refreshes their last use in MongoDB.
+
+        :param entries: {"vector", "match", "index_hash"} keyed by description key.
+        """
+        with self._lock:
+            for key, entry in entries.items():
+                self._remember(key, entry)
+
+        if entries and self.collection is not None:
+            now = datetime.now(UTC)
+            self.collection.bulk_write([
+                UpdateOne(
+                    {"_id": key},
+                    {"$set": {
+                        "vector": Binary(np.asarray(entry["vector"], dtype=np.float32).tobytes()),
+                        "match": entry["match"],
+                        "index_hash": entry["index_hash"],
+                        "last_used_at": now,
+                    }},
+                    upsert=True,
+                )
+                for key, entry in entries.items()
+            ], ordered=False)
+
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
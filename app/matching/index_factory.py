@@ -0,0 +1,71 @@
+import math
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+# "ip" is cosine similarity: vectors are L2-normalized and compared by inner product
+METRICS = ("l2", "ip")
+
+
+def prepare_vectors(vectors: np.ndarray, metric: str) -> np.ndarray:
+    """Returns float32 vectors in the form the index expects (normalized for cosine)."""
+    vectors = np.array(vectors, dtype=np.float32, copy=True).reshape(len(vectors), -1)
+    if metric == "ip":
+        faiss.normalize_L2(vectors)
+    return vectors
+
+
+def default_nlist(count: int) -> int:
+    """Number of IVF lists: ~4 * sqrt(n), with enough points per list to train on."""
+    return max(1, min(int(4 * math.sqrt(count)), count // 39 or 1))
+
+
+def build_index(vectors: np.ndarray, index_type: str = "flat", metric: str = "l2", nlist: int = None,
+                nprobe: int = 8, hnsw_m: int = 32, ef_construction: int = 80, ef_search: int = 64):
+    """
+    Builds (and trains, if needed) a FAISS index over the vectors.
+
+    :param vectors: Vectors to index, already passed through prepare_vectors.
+    :param index_type: "flat" (exact), "ivf" (inverted lists) or "hnsw" (graph).
+    :param metric: "l2" or "ip" (cosine on normalized vectors).
+    :param nlist: IVF lists, defaults to default_nlist().
+    :param nprobe: IVF lists visited per query.
+    :param hnsw_m: HNSW neighbors per node.
+    :param ef_construction: HNSW build-time search depth.
+    :param ef_search: HNSW query-time search depth.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{index_type}', expected one of {INDEX_TYPES}")
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {METRICS}")
+
+    dimension = vectors.shape[1]
+    faiss_metric = faiss.METRIC_INNER_PRODUCT if metric == "ip" else faiss.METRIC_L2
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(dimension) if metric == "ip" else faiss.IndexFlatL2(dimension)
+
+    elif index_type == "ivf":
+        nlist = min(nlist or default_nlist(len(vectors)), len(vectors))
+        quantizer = faiss.IndexFlatIP(dimension) if metric == "ip" else faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss_metric)
+        # IVF clusters the vectors into lists before anything can be added
+        index.train(vectors)
+        index.nprobe = min(nprobe, nlist)
+
+    else:
+        index = faiss.IndexHNSWFlat(dimension, hnsw_m, faiss_metric)
+        index.hnsw.efConstruction = ef_construction
+        index.hnsw.efSearch = ef_search
+
+    index.add(vectors)
+    return index
+
+
+def configure_search(index, nprobe: int = 8, ef_search: int = 64) -> None:
+    """Applies query-time parameters; they can be tuned without rebuilding the index."""
+    if isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(nprobe, index.nlist)
+    elif isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import time
+
+import faiss
+import numpy as np
+
+from app.config.logger_config import LoggerConfig
+from app.matching.index_factory import build_index, configure_search, prepare_vectors
+
+logger = LoggerConfig.get_logger()
+
+
+class IngredientIndex:
+    """
+    Ingredient names, their embeddings and a FAISS index over them, persisted to disk.
+
+    Vectors are cached by a hash of (model name, ingredient name), so only new names are
+    encoded; the index is rebuilt only when the list of names or the index options change
+    and is memory-mapped on load otherwise.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    KEYS_FILE = "keys.json"
+    INDEX_FILE = "index.faiss"
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, model, model_name: str, cache_dir: str, index_type: str = "flat", metric: str = "l2",
+                 **index_options):
+        """
+        :param model: SentenceTransformer used to encode names missing from the cache.
+        :param model_name: Model name, part of the cache key so a model change re-encodes everything.
+        :param cache_dir: Directory holding the cached vectors and index.
+        :param index_type: "flat", "ivf" or "hnsw" (see index_factory.build_index).
+        :param metric: "l2" or "ip" (cosine on normalized vectors).
+        :param index_options: Extra build_index options (nlist, nprobe, hnsw_m, ef_construction, ef_search).
+        """
+        self.model = model
+        self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.index_type = index_type
+        self.metric = metric
+        self.index_options = index_options
+        self.names = []
+        # Identifies the ingredient list and index options the index was built from
+        self.index_hash = None
+        self.vectors = None
+        self.index = None
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.cache_dir, filename)
+
+    def _key(self, name: str) -> str:
+        return hashlib.sha1(f"{self.model_name}\0{name}".encode()).hexdigest()
+
+    def _index_hash(self, keys: list) -> str:
+        build_options = {key: value for key, value in self.index_options.items() if key not in ("nprobe", "ef_search")}
+        options = json.dumps({"type": self.index_type, "metric": self.metric, **build_options}, sort_keys=True)
+        return hashlib.sha1("\n".join([options, *keys]).encode()).hexdigest()
+
+    def _read_json(self, filename: str):
+        try:
+            with open(self._path(filename), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_atomic(self, filename: str, write):
+        """Writes through a temporary file so an interrupted run never leaves a half-written cache."""
+        tmp_path = self._path(f"{filename}.tmp")
+        write(tmp_path)
+        os.replace(tmp_path, self._path(filename))
+
+    def _write_json(self, filename: str, data):
+        def write(path):
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+        self._write_atomic(filename, write)
+
+    def _write_vectors(self, vectors: np.ndarray):
+        def write(path):
+            with open(path, "wb") as file:
+                np.save(file, vectors)
+        self._write_atomic(self.VECTORS_FILE, write)
+
+    def _read_index(self):
+        try:
+            return faiss.read_index(self._path(self.INDEX_FILE), faiss.IO_FLAG_MMAP)
+        except RuntimeError:
+            # Index types without memory-map support are read into memory
+            return faiss.read_index(self._path(self.INDEX_FILE))
+
+    def _load_cached_vectors(self) -> dict:
+        """Returns cached vectors keyed by name hash (backed by a memory map)."""
+        keys = self._read_json(self.KEYS_FILE)
+        if not keys or not os.path.exists(self._path(self.VECTORS_FILE)):
+            return {}
+        vectors = np.load(self._path(self.VECTORS_FILE), mmap_mode="r")
+        if len(vectors) != len(keys):
+            return {}
+        return {key: vectors[row] for row, key in enumerate(keys)}
+
+    def load(self, names: list) -> "IngredientIndex":
+        """
+        Loads vectors and the index for the given names, encoding and indexing only what changed.
+
+        :param names: Ingredient names; their order defines the index row ids.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.names = list(names)
+        keys = [self._key(name) for name in self.names]
+
+        start_time = time.time()
+        cached = self._load_cached_vectors()
+        missing = [name for name, key in zip(self.names, keys) if key not in cached]
+        if missing:
+            encoded = np.asarray(self.model.encode(missing, batch_size=64, convert_to_numpy=True), dtype=np.float32)
+            cached.update({self._key(name): vector for name, vector in zip(missing, encoded)})
+        logger.info(f"Encoded {len(missing)} new of {len(self.names)} ingredients "
+                    f"in {time.time() - start_time:.2f} sec.")
+
+        start_time = time.time()
+        index_hash = self.index_hash = self._index_hash(keys)
+        manifest = self._read_json(self.MANIFEST_FILE) or {}
+        if not missing and manifest.get("index_hash") == index_hash and os.path.exists(self._path(self.INDEX_FILE)):
+            self.vectors = np.load(self._path(self.VECTORS_FILE), mmap_mode="r")
+            self.index = self._read_index()
+            self._configure_search()
+            logger.info(f"FAISS index loaded from cache in {time.time() - start_time:.2f} sec.")
+            return self
+
+        # Copy out of the memory map before the cache files are replaced
+        vectors = np.array([cached[key] for key in keys], dtype=np.float32).reshape(len(keys), -1)
+        del cached
+        index = build_index(prepare_vectors(vectors, self.metric), self.index_type, self.metric, **self.index_options)
+
+        # Without the keys file the vectors are ignored, so a crash in between only costs a re-encode
+        if os.path.exists(self._path(self.KEYS_FILE)):
+            os.remove(self._path(self.KEYS_FILE))
+        self._write_vectors(vectors)
+        self._write_json(self.KEYS_FILE, keys)
+        self._write_atomic(self.INDEX_FILE, lambda path: faiss.write_index(index, path))
+        # Written last: it marks the other files as a consistent set
+        self._write_json(self.MANIFEST_FILE, {"model_name": self.model_name, "index_hash": index_hash,
+                                              "index_type": self.index_type, "metric": self.metric,
+                                              "count": len(keys)})
+
+        self.vectors = vectors
+        self.index = index
+        logger.info(f"FAISS {self.index_type}/{self.metric} index created in {time.time() - start_time:.2f} sec.")
+        return self
+
+    def _configure_search(self):
+        search_options = {key: self.index_options[key] for key in ("nprobe", "ef_search") if key in self.index_options}
+        configure_search(self.index, **search_options)
+
+    def search(self, vectors: np.ndarray, k: int = 1):
+        """
+        Finds the k nearest ingredients for each vector.
+
+        :return: (scores, ids) as returned by FAISS: squared distances for "l2" (lower is closer),
+                 cosine similarities for "ip" (higher is closer).
+        """
+        return self.index.search(prepare_vectors(vectors, self.metric), k)
+
+    def similarity(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Converts search scores to cosine similarity (1 is identical).
+
+        For "l2" this assumes unit-length embeddings, as produced by all-MiniLM-L6-v2,
+        where the squared distance is 2 - 2 * cosine.
+        """
+        scores = np.asarray(scores, dtype=np.float32)
+        return scores if self.metric == "ip" else 1 - scores / 2
+
+    def top_matches(self, vectors: np.ndarray, k: int = 1) -> list:
+        """
+        Returns the k best ingredients for each vector, best first.
+
+        :return: One list of {"ingredient_name", "score"} per vector; score is the cosine similarity.
+        """
+        scores, ids = self.search(vectors, min(k, len(self.names)))
+        similarities = self.similarity(scores)
+        return [
+            [{"ingredient_name": self.names[row_id], "score": round(float(score), 4)}
+             # Approximate indexes pad with -1 when they find fewer than k neighbors
+             for row_id, score in zip(row_ids, row_scores) if row_id >= 0]
+            for row_ids, row_scores in zip(ids, similarities)
+        ]
@@ -0,0 +1,118 @@
+import numpy as np
+
+from app.config.config import Config
+from app.matching.description_cache import DescriptionCache
+from app.matching.ingredient_index import IngredientIndex
+
+
+class IngredientMatcher:
+    """
+    Matches product descriptions to ingredients: embeds them with the model
+    and looks up the closest ingredients in the index.
+
+    match() runs both steps; embed() and search() run them separately, so a pipeline
+    can encode one batch while searching the previous one.
+    """
+
+    def __init__(self, model, ingredient_index: IngredientIndex, description_cache: DescriptionCache,
+                 top_k: int = 3, min_score: float = 0.5):
+        """
+        :param model: SentenceTransformer used to encode descriptions.
+        :param ingredient_index: Loaded index of the ingredient names.
+        :param description_cache: Cache of description vectors and matches.
+        :param top_k: Candidates returned per description.
+        :param min_score: Cosine similarity the best candidate needs to be accepted.
+        """
+        self.model = model
+        self.ingredient_index = ingredient_index
+        self.description_cache = description_cache
+        self.top_k = top_k
+        self.min_score = min_score
+        # Cached matches are only valid for the index and the number of candidates they were made with
+        self.match_hash = f"{ingredient_index.index_hash}:{top_k}"
+
+    def match(self, descriptions: list) -> list:
+        """
+        Returns the top_k most similar ingredients for every description.
+
+        Descriptions seen before skip the transformer, and skip the FAISS search too
+        if the ingredient index did not change since.
+
+        :return: One list of {"ingredient_name", "score"} per description, best first.
+        """
+        return self.search(self.embed(descriptions))
+
+    def _encode(self, texts: list) -> np.ndarray:
+        return self.model.encode(texts, batch_size=64, convert_to_numpy=True)
+
+    def embed(self, descriptions: list, encode=None) -> dict:
+        """
+        First half of match(): looks descriptions up in the cache and encodes the others.
+
+        :param encode: Function encoding a list of texts, defaults to the model on this process.
+        :return: State to pass to search().
+        """
+        keys = [self.description_cache.key(description) for description in descriptions]
+        cached = self.description_cache.get_many(keys)
+
+        # Each distinct description is encoded once
+        to_encode = {}
+        for key, description in zip(keys, descriptions):
+            if key not in cached:
+                to_encode.setdefault(key, description)
+
+        vectors = {key: entry["vector"] for key, entry in cached.items()}
+        if to_encode:
+            encoded = np.array((encode or self._encode)(list(to_encode.values())), dtype=np.float32)
+            vectors.update(zip(to_encode.keys(), encoded.reshape(len(to_encode), -1)))
+
+        matches = {key: entry["match"] for key, entry in cached.items() if entry["index_hash"] == self.match_hash}
+        return {"keys": keys, "vectors": vectors, "matches": matches}
+
+    def search(self, embedded: dict) -> list:
+        """Second half of match(): searches the index for descriptions without a cached match."""
+        keys, vectors, matches = embedded["keys"], embedded["vectors"], embedded["matches"]
+        unmatched = [key for key in vectors if key not in matches]
+        if unmatched:
+            candidates = self.ingredient_index.top_matches(np.stack([vectors[key] for key in unmatched]), self.top_k)
+            updates = {}
+            for key, top in zip(unmatched, candidates):
+                matches[key] = top
+                updates[key] = {"vector": vectors[key], "match": top, "index_hash": self.match_hash}
+            self.description_cache.put_many(updates)
+
+        return [matches[key] for key in keys]
+
+    def accept(self, candidates: list) -> dict | None:
+        """Returns the best candidate if it is confident enough, None otherwise."""
+        if candidates and candidates[0]["score"] >= self.min_score:
+            return candidates[0]
+        return None
+
+
+def create_matcher(ingredient_names: list, description_cache_collection=None) -> IngredientMatcher:
+    """
+    Loads the model and the ingredient index configured in Config.
+
+    Slow (loads the model, may encode ingredients and build the index); call it off the event loop.
+
+    :param ingredient_names: Ingredient names to match against.
+    :param description_cache_collection: Optional pymongo collection persisting the description cache.
+    """
+    # Heavy dependency, only needed where matching runs
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(Config.MATCHING_MODEL_NAME)
+    # Sorted so the index row ids stay stable between runs
+    ingredient_index = IngredientIndex(
+        model, Config.MATCHING_MODEL_NAME, Config.INGREDIENT_INDEX_CACHE_DIR,
+        index_type=Config.INGREDIENT_INDEX_TYPE, metric=Config.INGREDIENT_INDEX_METRIC,
+        nprobe=Config.INGREDIENT_INDEX_NPROBE, hnsw_m=Config.INGREDIENT_INDEX_HNSW_M,
+        ef_search=Config.INGREDIENT_INDEX_EF_SEARCH,
+    ).load(sorted(ingredient_names))
+    description_cache = DescriptionCache(Config.MATCHING_MODEL_NAME, description_cache_collection,
+                                         max_size=Config.DESCRIPTION_CACHE_SIZE,
+                                         ttl_days=Config.DESCRIPTION_CACHE_TTL_DAYS)
+    description_cache.ensure_indexes()
+    return IngredientMatcher(model, ingredient_index, description_cache,
+                             top_k=Config.MATCH_TOP_K, min_score=Config.MATCH_MIN_SCORE)
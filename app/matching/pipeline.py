@@ -0,0 +1,92 @@
+import queue
+import threading
+
+# Marks the end of the stream
+_DONE = object()
+
+
+class _Failure:
+    """Carries an exception from a stage down to the sink."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _put(outbox: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocks until the item is queued; gives up (returns False) once the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            outbox.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read(source, outbox: queue.Queue, stop: threading.Event):
+    try:
+        for item in source:
+            if not _put(outbox, item, stop):
+                return
+    except BaseException as e:
+        _put(outbox, _Failure(e), stop)
+        return
+    _put(outbox, _DONE, stop)
+
+
+def _work(stage, inbox: queue.Queue, outbox: queue.Queue, stop: threading.Event):
+    while True:
+        try:
+            item = inbox.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return
+            continue
+        if item is not _DONE and not isinstance(item, _Failure):
+            try:
+                item = stage(item)
+            except BaseException as e:
+                item = _Failure(e)
+        if not _put(outbox, item, stop) or item is _DONE or isinstance(item, _Failure):
+            return
+
+
+def run_pipeline(source, stages: list, sink, queue_size: int = 2) -> None:
+    """
+    Runs items through stages that work concurrently, each on its own thread.
+
+    While the sink handles one item, the stages are already working on the next ones.
+    Queues between stages hold at most queue_size items, so a fast stage waits for a slow
+    one instead of piling items up in memory. Items reach the sink in source order.
+    The first error in any stage stops the pipeline and is raised here.
+
+    Stages should spend their time outside the GIL (I/O, numpy, FAISS, worker processes).
+
+    :param source: Iterable of items, consumed on a reader thread.
+    :param stages: Functions applied to every item, in order.
+    :param sink: Function receiving every processed item, called on the calling thread.
+    :param queue_size: Max items waiting between two stages.
+    """
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    threads = [threading.Thread(target=_read, args=(source, queues[0], stop), name="pipeline-reader", daemon=True)]
+    threads += [
+        threading.Thread(target=_work, args=(stage, queues[i], queues[i + 1], stop),
+                         name=f"pipeline-stage-{i}", daemon=True)
+        for i, stage in enumerate(stages)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            sink(item)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
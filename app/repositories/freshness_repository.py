@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta, UTC
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class FreshnessRepository:
+    """When each (ingredient, store) pair was last fully scraped, and what its first page looked like."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.freshness_collection = db[Config.MONGO_FRESHNESS_COLLECTION_NAME]
+
+    async def ensure_indexes(self) -> None:
+        """Creates the indexes the repository relies on. Safe to call on every startup."""
+        try:
+            await self.freshness_collection.create_index(
+                [("ingredient_name", ASCENDING), ("locationId", ASCENDING)],
+                name="ingredient_name_locationId_unique",
+                unique=True,
+            )
+        except PyMongoError as e:
+            logger.error(f"Could not create freshness indexes: {e}")
+
+    async def find_fresh(self, ingredient_name: str, location_id: str, max_age_seconds: int) -> dict | None:
+        """Returns the pair's entry if it was fully scraped within max_age_seconds, None otherwise."""
+        return await self.freshness_collection.find_one({
+            "ingredient_name": ingredient_name,
+            "locationId": location_id,
+            "last_scraped_at": {"$gte": datetime.now(UTC) - timedelta(seconds=max_age_seconds)},
+        })
+
+    async def mark_scraped(self, ingredient_name: str, location_id: str, product_count: int,
+                           first_page_hash: str) -> None:
+        """Records a full scrape of the pair."""
+        now = datetime.now(UTC)
+        await self.freshness_collection.update_one(
+            {"ingredient_name": ingredient_name, "locationId": location_id},
+            {"$set": {
+                "last_scraped_at": now,
+                "last_checked_at": now,
+                "product_count": product_count,
+                "first_page_hash": first_page_hash,
+            }},
+            upsert=True,
+        )
+
+    async def mark_checked(self, ingredient_name: str, location_id: str) -> None:
+        """Records that the pair's first page was sampled and had not changed."""
+        await self.freshness_collection.update_one(
+            {"ingredient_name": ingredient_name, "locationId": location_id},
+            {"$set": {"last_checked_at": datetime.now(UTC)}},
+        )
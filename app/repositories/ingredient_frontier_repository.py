@@ -0,0 +1,82 @@
+import re
+from datetime import datetime, UTC
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import PyMongoError
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class IngredientFrontierRepository:
+    """
+    Every ingredient discovered in Spoonacular recipes, deduplicated by normalized name.
+
+    Scraping draws from the frontier the ingredients scraped longest ago (never scraped first),
+    so repeated runs cycle through everything discovered so far.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.frontier_collection = db[Config.MONGO_INGREDIENT_FRONTIER_COLLECTION_NAME]
+
+    async def ensure_indexes(self) -> None:
+        """Creates the indexes the repository relies on. Safe to call on every startup."""
+        try:
+            await self.frontier_collection.create_index(
+                [("last_scraped_at", ASCENDING), ("seen_count", DESCENDING)],
+                name="last_scraped_at_seen_count",
+            )
+        except PyMongoError as e:
+            logger.error(f"Could not create ingredient frontier indexes: {e}")
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Lowercases the name and collapses punctuation (except hyphens and apostrophes) and whitespace."""
+        name = re.sub(r"[^\w\s'-]", " ", name.lower())
+        return re.sub(r"\s+", " ", name).strip()
+
+    async def add_many(self, names) -> int:
+        """
+        Adds discovered ingredient names, counting how often each one was seen.
+
+        :return: Number of ingredients that were not in the frontier yet.
+        """
+        seen = {}
+        for name in names:
+            normalized = self.normalize(name)
+            if normalized:
+                seen[normalized] = seen.get(normalized, 0) + 1
+        if not seen:
+            return 0
+
+        now = datetime.now(UTC)
+        result = await self.frontier_collection.bulk_write([
+            UpdateOne(
+                {"_id": normalized},
+                {
+                    "$inc": {"seen_count": count},
+                    "$set": {"last_seen_at": now},
+                    "$setOnInsert": {"name": normalized, "first_seen_at": now, "last_scraped_at": None},
+                },
+                upsert=True,
+            )
+            for normalized, count in seen.items()
+        ], ordered=False)
+        return result.upserted_count
+
+    async def take_batch(self, limit: int) -> list:
+        """Returns up to `limit` ingredient names, never scraped or scraped longest ago first."""
+        cursor = (self.frontier_collection.find({}, {"name": 1})
+                  .sort([("last_scraped_at", ASCENDING), ("seen_count", DESCENDING)])
+                  .limit(limit))
+        return [document["name"] async for document in cursor]
+
+    async def mark_scraped(self, names: list) -> None:
+        if names:
+            await self.frontier_collection.update_many(
+                {"_id": {"$in": [self.normalize(name) for name in names]}},
+                {"$set": {"last_scraped_at": datetime.now(UTC)}},
+            )
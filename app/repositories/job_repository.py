@@ -0,0 +1,86 @@
+import uuid
+from datetime import datetime, UTC
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class JobRepository:
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.jobs_collection = db[Config.MONGO_JOBS_COLLECTION_NAME]
+
+    async def ensure_indexes(self) -> None:
+        """Creates the indexes the repository relies on. Safe to call on every startup."""
+        try:
+            # At most one active job per kind, across all API workers and scrape.py processes
+            await self.jobs_collection.create_index(
+                [("kind", ASCENDING)],
+                name="kind_active_unique",
+                unique=True,
+                partialFilterExpression={"active": True},
+            )
+            await self.jobs_collection.create_index([("created_at", DESCENDING)], name="created_at")
+        except PyMongoError as e:
+            logger.error(f"Could not create job indexes: {e}")
+
+    async def create(self, kind: str) -> dict:
+        """
+        Registers a new active job.
+
+        :param kind: Job type, e.g. "scrape".
+        :return: The job document.
+        :raises DuplicateKeyError: If an active job of the same kind already exists.
+        """
+        now = datetime.now(UTC)
+        job = {
+            "_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": self.PENDING,
+            "active": True,
+            "progress": {},
+            "error": None,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+            "updated_at": now,
+        }
+        await self.jobs_collection.insert_one(job)
+        return job
+
+    async def get(self, job_id: str) -> dict | None:
+        return await self.jobs_collection.find_one({"_id": job_id})
+
+    async def find_active(self, kind: str) -> dict | None:
+        return await self.jobs_collection.find_one({"kind": kind, "active": True})
+
+    async def mark_running(self, job_id: str) -> None:
+        now = datetime.now(UTC)
+        await self.jobs_collection.update_one(
+            {"_id": job_id},
+            {"$set": {"status": self.RUNNING, "started_at": now, "updated_at": now}},
+        )
+
+    async def update_progress(self, job_id: str, progress: dict) -> None:
+        await self.jobs_collection.update_one(
+            {"_id": job_id},
+            {"$set": {"progress": progress, "updated_at": datetime.now(UTC)}},
+        )
+
+    async def finish(self, job_id: str, status: str, error: str = None) -> None:
+        """Marks the job as completed or failed and releases its kind for the next job."""
+        now = datetime.now(UTC)
+        await self.jobs_collection.update_one(
+            {"_id": job_id},
+            {"$set": {"status": status, "active": False, "error": error, "finished_at": now, "updated_at": now}},
+        )
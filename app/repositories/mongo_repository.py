@@ -1,17 +1,224 @@
+import asyncio
 from datetime import datetime, UTC
+from typing import AsyncIterator
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
 from pymongo.errors import PyMongoError
 
 from app.config.config import Config
 from app.config.logger_config import LoggerConfig
+from app.handlers.response_cache import response_cache
 
 logger = LoggerConfig.get_logger()
 
 
 class MongoRepository:
     def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
         self.products_collection = db[Config.MONGO_COLLECTION_NAME]
+        self.price_history_collection = db[Config.MONGO_PRICE_HISTORY_COLLECTION_NAME]
+
+    async def ensure_indexes(self) -> None:
+        """Creates the collections and indexes the repository relies on. Safe to call on every startup."""
+        await self._ensure_price_history_collection()
+        try:
+            # One document per product and store, so re-runs update instead of appending
+            await self.products_collection.create_index(
+                [("productId", ASCENDING), ("locationId", ASCENDING)],
+                name="productId_locationId_unique",
+                unique=True,
+            )
+        except PyMongoError as e:
+            # Typically duplicates left by insert-only runs; upserts still work, just without the guarantee
+            logger.error(f"Could not create unique (productId, locationId) index: {e}")
+        await self._ensure_product_query_indexes()
+
+    async def _ensure_product_query_indexes(self) -> None:
+        """Creates the indexes behind find_products: equality filters first, then the (date, _id) sort key."""
+        try:
+            await self.products_collection.create_indexes([
+                IndexModel([("ingredient_name", ASCENDING), ("locationId", ASCENDING),
+                            ("date", DESCENDING), ("_id", DESCENDING)], name="ingredient_location_date_id"),
+                IndexModel([("ingredient_name", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)],
+                           name="ingredient_date_id"),
+                IndexModel([("locationId", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)],
+                           name="location_date_id"),
+                IndexModel([("date", DESCENDING), ("_id", DESCENDING)], name="date_id"),
+            ])
+        except PyMongoError as e:
+            logger.error(f"Could not create product query indexes: {e}")
+
+    async def _ensure_price_history_collection(self) -> None:
+        """Creates the price history time-series collection if it does not exist yet."""
+        name = Config.MONGO_PRICE_HISTORY_COLLECTION_NAME
+        try:
+            if name not in await self.db.list_collection_names(filter={"name": name}):
+                await self.db.create_collection(
+                    name,
+                    timeseries={"timeField": "timestamp", "metaField": "meta", "granularity": "hours"},
+                )
+                logger.info(f"Created price history time-series collection '{name}'")
+
+            # "Price trend for ingredient X" reads
+            await self.price_history_collection.create_index(
+                [("meta.ingredient_name", ASCENDING), ("meta.locationId", ASCENDING), ("timestamp", ASCENDING)],
+                name="ingredient_location_timestamp",
+            )
+        except PyMongoError as e:
+            logger.error(f"Could not prepare price history collection '{name}': {e}")
+
+    async def find_products(self, ingredient_name: str = None, location_id: str = None, min_price: float = None,
+                            max_price: float = None, date_from: datetime = None, date_to: datetime = None,
+                            fields: list = None, after: tuple = None, limit: int = 50) -> list:
+        """
+        Returns products newest first, one page at a time.
+
+        Pages are walked by keyset rather than skip, so every page costs the same however deep it is:
+        the next page starts after the (date, _id) of the last product of the previous one.
+
+        :param ingredient_name: Only products scraped for this ingredient.
+        :param location_id: Only products of this store.
+        :param min_price: Lowest regular price.
+        :param max_price: Highest regular price.
+        :param date_from: Products first seen at or after this time.
+        :param date_to: Products first seen at or before this time.
+        :param fields: Fields to return (_id and date are always returned), None for every field.
+        :param after: (date, _id) of the last product of the previous page.
+        :param limit: Max products returned.
+        """
+        query = {}
+        if ingredient_name is not None:
+            query["ingredient_name"] = ingredient_name
+        if location_id is not None:
+            query["locationId"] = location_id
+        price = {key: value for key, value in (("$gte", min_price), ("$lte", max_price)) if value is not None}
+        if price:
+            query["price.regular"] = price
+        dates = {key: value for key, value in (("$gte", date_from), ("$lte", date_to)) if value is not None}
+        if dates:
+            query["date"] = dates
+        if after is not None:
+            last_date, last_id = after
+            if last_date is None:
+                # Products without a date sort last, so only they can follow
+                query["$and"] = [{"date": None}, {"_id": {"$lt": last_id}}]
+            else:
+                query["$or"] = [{"date": {"$lt": last_date}}, {"date": last_date, "_id": {"$lt": last_id}}]
+
+        projection = None
+        if fields:
+            projection = dict.fromkeys(fields, 1)
+            projection["date"] = 1
+
+        cursor = (self.products_collection.find(query, projection)
+                  .sort([("date", DESCENDING), ("_id", DESCENDING)])
+                  .limit(limit))
+        return [product async for product in cursor]
+
+    async def find_product(self, product_id: str, location_id: str = None) -> list:
+        """Returns the product's documents, one per store (or only the given store's)."""
+        query = {"productId": product_id}
+        if location_id is not None:
+            query["locationId"] = location_id
+        return [product async for product in self.products_collection.find(query)]
+
+    @staticmethod
+    def _extract_price(product: dict) -> dict | None:
+        """Returns the regular/promo price of the product's first item, if Kroger reported one."""
+        for item in product.get("items") or []:
+            price = item.get("price")
+            if price:
+                return {"regular": price.get("regular"), "promo": price.get("promo")}
+        return None
+
+    async def _get_stored_products(self, product_ids: list, location_id: str) -> dict:
+        """Returns the latest stored price and ingredient_name of the products, keyed by productId."""
+        cursor = self.products_collection.find(
+            {"productId": {"$in": product_ids}, "locationId": location_id},
+            {"_id": 0, "productId": 1, "price": 1, "ingredient_name": 1},
+        )
+        return {doc["productId"]: doc async for doc in cursor}
+
+    async def upsert_ingredients(self, ingredients: list, ingredient_name: str, source_id: str,
+                                 location_id: str, previous_ingredients: set = None) -> dict:
+        """
+        Inserts or updates ingredients in MongoDB, one document per (productId, locationId).
+
+        The products collection holds the latest snapshot; a price point is appended to the
+        price history collection only when a product's price differs from the stored one.
+
+        :param ingredients: List of ingredients.
+        :param ingredient_name: Name of the ingredient.
+        :param source_id: Data source ID.
+        :param location_id: The store's ID.
+        :param previous_ingredients: Optional set that receives the other ingredients the products were
+                                     stored under (a product found by several searches moves to the latest one).
+        :return: Counts of inserted, modified and unchanged records.
+        """
+        counts = {"inserted": 0, "modified": 0, "unchanged": 0}
+        try:
+            if not ingredients:
+                return counts
+
+            now = datetime.now(UTC)
+            stored = await self._get_stored_products([item["productId"] for item in ingredients], location_id)
+            operations = []
+            price_points = []
+            for item in ingredients:
+                product = {key: value for key, value in item.items() if key != "_id"}
+                product["locationId"] = location_id
+                product["ingredient_name"] = ingredient_name
+                product["source_id"] = source_id
+                product["price"] = self._extract_price(product)
+
+                # History only grows when the price actually moved (or the product is new)
+                stored_product = stored.get(product["productId"], {})
+                if product["price"] and stored_product.get("price") != product["price"]:
+                    price_points.append({
+                        "timestamp": now,
+                        "meta": {
+                            "productId": product["productId"],
+                            "locationId": location_id,
+                            "ingredient_name": ingredient_name,
+                        },
+                        **product["price"],
+                    })
+
+                operations.append(UpdateOne(
+                    {"productId": product["productId"], "locationId": location_id},
+                    # "date" is only stamped on insert, so an unchanged product is not rewritten
+                    {"$set": product, "$setOnInsert": {"date": now}},
+                    upsert=True,
+                ))
+
+            # History first: if the snapshot write fails the next run sees the change again (a duplicate
+            # point is harmless), whereas a snapshot written ahead of a failed history insert loses the point
+            if price_points:
+                await self.price_history_collection.insert_many(price_points, ordered=False)
+
+            result = await self.products_collection.bulk_write(operations, ordered=False)
+            counts["inserted"] = result.upserted_count
+            counts["modified"] = result.modified_count
+            counts["unchanged"] = result.matched_count - result.modified_count
+            moved_from = {
+                product["ingredient_name"] for product in stored.values()
+                if product.get("ingredient_name") and product["ingredient_name"] != ingredient_name
+            }
+            if previous_ingredients is not None:
+                previous_ingredients.update(moved_from)
+
+            if counts["inserted"] or counts["modified"]:
+                # Responses for the ingredients the products moved away from still list them
+                for name in {ingredient_name, *moved_from}:
+                    response_cache.invalidate(name)
+            logger.info(f"Upserted records for ingredient '{ingredient_name}' at location '{location_id}' "
+                        f"from source '{source_id}': {counts}, {len(price_points)} price changes")
+            return counts
+
+        except PyMongoError as e:
+            logger.error(f"MongoDB upsert error: {e}")
+            raise
 
     async def save_ingredients(self, ingredients: list, ingredient_name: str, source_id: str) -> int:
         """
@@ -34,9 +241,53 @@ class MongoRepository:
 
             result = await self.products_collection.insert_many(ingredients)
             count = len(result.inserted_ids)
+            response_cache.invalidate(ingredient_name)
             logger.info(f"Inserted {count} records for ingredient '{ingredient_name}' from source '{source_id}'")
             return count
 
         except PyMongoError as e:
             logger.error(f"MongoDB save error: {e}")
             raise
+
+    async def save_ingredient_pages(self, pages: AsyncIterator[list], ingredient_name: str, source_id: str,
+                                    location_id: str, previous_ingredients: set = None) -> dict:
+        """
+        Upserts pages of ingredients to MongoDB as they arrive.
+
+        Fetching runs one page ahead of the writes, so network I/O overlaps with the writes
+        while only a couple of pages are held in memory.
+
+        :param pages: Async iterator of ingredient lists (e.g. KrogerAPIClient.iter_product_pages()).
+        :param ingredient_name: Name of the ingredient.
+        :param source_id: Data source ID.
+        :param location_id: The store's ID.
+        :param previous_ingredients: Optional set that receives the other ingredients the products were stored under.
+        :return: Counts of inserted, modified and unchanged records.
+        """
+        queue = asyncio.Queue(maxsize=1)
+
+        async def produce():
+            try:
+                async for page in pages:
+                    await queue.put(page)
+            except Exception as e:
+                # Hand fetch errors over to the writer so they surface in the caller
+                await queue.put(e)
+                return
+            await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        counts = {"inserted": 0, "modified": 0, "unchanged": 0}
+        try:
+            while (page := await queue.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                page_counts = await self.upsert_ingredients(page, ingredient_name, source_id, location_id,
+                                                            previous_ingredients)
+                for key, value in page_counts.items():
+                    counts[key] += value
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+        return counts
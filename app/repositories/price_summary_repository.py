@@ -0,0 +1,104 @@
+from datetime import datetime, UTC
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+from app.handlers.response_cache import response_cache
+
+logger = LoggerConfig.get_logger()
+
+
+class PriceSummaryRepository:
+    """
+    Price statistics per (ingredient, store), materialized from the products collection.
+
+    Only the ingredients a scrape or a matching pass touched are recomputed, with an aggregation
+    that $merges its result into the summary collection, so readers never scan the products.
+    """
+
+    # $merge matches summaries on these fields, which requires a unique index on them
+    MERGE_ON = ["ingredient_name", "locationId"]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.products_collection = db[Config.MONGO_COLLECTION_NAME]
+        self.summary_collection = db[Config.MONGO_PRICE_SUMMARY_COLLECTION_NAME]
+
+    async def ensure_indexes(self) -> None:
+        """Creates the indexes the repository relies on. Safe to call on every startup."""
+        try:
+            await self.summary_collection.create_index(
+                [(field, ASCENDING) for field in self.MERGE_ON],
+                name="ingredient_name_locationId_unique",
+                unique=True,
+            )
+        except PyMongoError as e:
+            logger.error(f"Could not create price summary indexes: {e}")
+
+    @classmethod
+    def pipeline(cls, ingredient_names: list, updated_at: datetime) -> list:
+        """
+        Returns the aggregation (run on the products collection) that recomputes the ingredients' summaries.
+
+        $median needs MongoDB 7.0 or newer.
+        """
+        return [
+            {"$match": {"ingredient_name": {"$in": ingredient_names}, "price.regular": {"$type": "number"}}},
+            {"$group": {
+                "_id": {"ingredient_name": "$ingredient_name", "locationId": "$locationId"},
+                "min_price": {"$min": "$price.regular"},
+                "median_price": {"$median": {"input": "$price.regular", "method": "approximate"}},
+                "max_price": {"$max": "$price.regular"},
+                "avg_price": {"$avg": "$price.regular"},
+                "product_count": {"$sum": 1},
+            }},
+            {"$project": {
+                "_id": 0,
+                "ingredient_name": "$_id.ingredient_name",
+                "locationId": "$_id.locationId",
+                "min_price": 1,
+                "median_price": 1,
+                "max_price": 1,
+                "avg_price": {"$round": ["$avg_price", 2]},
+                "product_count": 1,
+                "updated_at": {"$literal": updated_at},
+            }},
+            {"$merge": {
+                "into": Config.MONGO_PRICE_SUMMARY_COLLECTION_NAME,
+                "on": cls.MERGE_ON,
+                "whenMatched": "replace",
+                "whenNotMatched": "insert",
+            }},
+        ]
+
+    @staticmethod
+    def stale_query(ingredient_names: list, updated_at: datetime) -> dict:
+        """Matches the ingredients' summaries the last refresh did not rewrite (no priced products left there)."""
+        return {"ingredient_name": {"$in": ingredient_names}, "updated_at": {"$lt": updated_at}}
+
+    async def refresh(self, ingredient_names) -> None:
+        """Recomputes the summaries of the given ingredients in every store."""
+        ingredient_names = sorted(set(ingredient_names))
+        if not ingredient_names:
+            return
+        updated_at = datetime.now(UTC)
+        # $merge writes the summaries and returns no documents; the cursor only has to be run
+        await self.products_collection.aggregate(self.pipeline(ingredient_names, updated_at)).to_list(None)
+        await self.summary_collection.delete_many(self.stale_query(ingredient_names, updated_at))
+        for ingredient_name in ingredient_names:
+            response_cache.invalidate(ingredient_name)
+        logger.info(f"Refreshed price summaries of {len(ingredient_names)} ingredients")
+
+    async def find(self, ingredient_name: str = None, location_id: str = None) -> list:
+        """Returns summaries ordered by ingredient, cheapest store first."""
+        query = {}
+        if ingredient_name is not None:
+            query["ingredient_name"] = ingredient_name
+        if location_id is not None:
+            query["locationId"] = location_id
+        cursor = self.summary_collection.find(query, {"_id": 0}).sort(
+            [("ingredient_name", ASCENDING), ("min_price", ASCENDING)]
+        )
+        return [summary async for summary in cursor]
@@ -0,0 +1,53 @@
+import time
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class TokenRepository:
+    """
+    Access tokens shared by every process using the same API credentials.
+
+    One document per token name holds the token, its expiry (epoch seconds) and a refresh lease,
+    so that only one process mints a new token while the others wait for it.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.tokens_collection = db[Config.MONGO_TOKENS_COLLECTION_NAME]
+
+    async def get(self, name: str) -> dict | None:
+        """Returns the stored token ({"access_token", "expires_at"}), None if there is none."""
+        return await self.tokens_collection.find_one({"_id": name}, {"access_token": 1, "expires_at": 1})
+
+    async def save(self, name: str, access_token: str, expires_at: float) -> None:
+        """Stores a new token and releases the refresh lease."""
+        await self.tokens_collection.update_one(
+            {"_id": name},
+            {"$set": {"access_token": access_token, "expires_at": expires_at, "lease_until": 0}},
+            upsert=True,
+        )
+
+    async def try_lease(self, name: str, owner: str, seconds: float) -> bool:
+        """
+        Takes the right to refresh the token for the next `seconds`.
+
+        :return: False if another process holds an unexpired lease.
+        """
+        now = time.time()
+        try:
+            document = await self.tokens_collection.find_one_and_update(
+                {"_id": name, "$or": [{"lease_until": {"$lte": now}}, {"lease_until": {"$exists": False}}]},
+                {"$set": {"lease_until": now + seconds, "lease_owner": owner}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # The document exists but its lease is held: the upsert collided with it
+            return False
+        return document is not None and document.get("lease_owner") == owner
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response, status
+
+from app.db.mongo_db import mongodb_client
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health(response: Response):
+    """Reports whether MongoDB answered the background pings (503 while it does not)."""
+    if not mongodb_client.is_healthy:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ok" if mongodb_client.is_healthy else "unavailable", "mongodb": mongodb_client.is_healthy}
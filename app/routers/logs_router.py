@@ -1,22 +1,64 @@
-from fastapi import APIRouter, WebSocket
 import asyncio
-from typing import List
+import logging
 
+from fastapi import APIRouter, WebSocket, status
+
+from app.config.config import Config
 from app.config.logger_config import LoggerConfig
-from app.handlers.web_socket_handler import connected_websockets
+from app.handlers.web_socket_handler import LogSubscription, log_broadcaster
 
 logger = LoggerConfig.get_logger()
 
 router = APIRouter()
 
+
+async def _send_logs(websocket: WebSocket, subscription: LogSubscription):
+    """Sends batches of log lines as they are published."""
+    while True:
+        batch = await subscription.next_batch()
+        await asyncio.wait_for(websocket.send_text(batch), Config.WS_LOG_SEND_TIMEOUT)
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    """Consumes client messages until the client disconnects."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
 @router.websocket("/logs")
-async def websocket_logs(websocket: WebSocket):
+async def websocket_logs(websocket: WebSocket, level: str = None, ingredient: str = None, replay: int = None):
+    """
+    Streams application logs.
+
+    :param level: Lowest log level to stream (e.g. "WARNING").
+    :param ingredient: Only stream lines mentioning this ingredient.
+    :param replay: Number of recent lines to send on connect, defaults to Config.WS_LOG_REPLAY_LINES.
+    """
+    min_level = logging.getLevelName(level.upper()) if level else logging.NOTSET
+    if not isinstance(min_level, int):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=f"Unknown log level: {level}")
+        return
+
     await websocket.accept()
-    connected_websockets.append(websocket)
+    subscription = log_broadcaster.subscribe(
+        min_level=min_level,
+        ingredient=ingredient,
+        replay=Config.WS_LOG_REPLAY_LINES if replay is None else replay,
+    )
+    tasks = [
+        asyncio.create_task(_send_logs(websocket, subscription)),
+        asyncio.create_task(_wait_for_disconnect(websocket)),
+    ]
     try:
-        while True:
-            await asyncio.sleep(0.1)
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        # Either the client left or it could not keep up with the sends
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not task.cancelled() and task.exception():
+                logger.error(f"WebSocket error: {task.exception()}")
     finally:
-        connected_websockets.remove(websocket)
+        log_broadcaster.unsubscribe(subscription)
+        for task in tasks:
+            task.cancel()
+        await asyncio.wait(tasks)
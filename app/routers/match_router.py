@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel, Field
+
+from app.services.matching_service import matching_service
+
+router = APIRouter()
+
+
+class MatchRequest(BaseModel):
+    descriptions: list[str] = Field(min_length=1, max_length=1000)
+
+
+@router.post("/match")
+async def match_ingredients(request: MatchRequest):
+    """Matches product descriptions to ingredients with confidence scores."""
+    if not matching_service.is_running:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Ingredient matching is not enabled")
+    return {"matches": await matching_service.match(request.descriptions)}
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.db_dependencies import get_mongo_database
+from app.handlers.response_cache import response_cache
+from app.services.product_service import ProductService
+
+router = APIRouter()
+
+
+@router.get("/products")
+async def list_products(
+        request: Request,
+        ingredient_name: str = None,
+        location_id: str = None,
+        min_price: float = Query(None, ge=0),
+        max_price: float = Query(None, ge=0),
+        date_from: datetime = None,
+        date_to: datetime = None,
+        fields: str = Query(None, description="Comma-separated fields to return"),
+        cursor: str = Query(None, description="next_cursor of the previous page"),
+        limit: int = Query(50, ge=1, le=200),
+        db: AsyncIOMotorDatabase = Depends(get_mongo_database)
+):
+    """Lists scraped products newest first; follow next_cursor for the next page."""
+    try:
+        return await response_cache.respond(request, lambda: ProductService(db).list_products(
+            cursor=cursor, fields=fields, limit=limit, ingredient_name=ingredient_name, location_id=location_id,
+            min_price=min_price, max_price=max_price, date_from=date_from, date_to=date_to,
+        ), ingredient_name=ingredient_name)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/price-summaries")
+async def list_price_summaries(
+        request: Request,
+        ingredient_name: str = None,
+        location_id: str = None,
+        db: AsyncIOMotorDatabase = Depends(get_mongo_database)
+):
+    """Min/median/max/avg regular price and product count per ingredient and store."""
+    async def produce():
+        return {"items": await ProductService(db).list_price_summaries(ingredient_name, location_id)}
+
+    return await response_cache.respond(request, produce, ingredient_name=ingredient_name)
+
+
+@router.get("/products/{product_id}")
+async def get_product(
+        request: Request,
+        product_id: str,
+        location_id: str = None,
+        db: AsyncIOMotorDatabase = Depends(get_mongo_database)
+):
+    async def produce():
+        products = await ProductService(db).get_product(product_id, location_id)
+        if not products:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return {"items": products}
+
+    return await response_cache.respond(request, produce)
@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.db.db_dependencies import get_mongo_database
-from app.services.scrap_service import ScrapService
+from app.services.job_service import JobService
 
 router = APIRouter()
 
-@router.post("/scrap-ingredients")
+@router.post("/scrap-ingredients", status_code=status.HTTP_202_ACCEPTED)
 async def scrap_spoonacular_ingredients(
         db: AsyncIOMotorDatabase = Depends(get_mongo_database)
 ):
-    service = ScrapService(db)
-    await service.start_scraping()
-    return {"message": "Scraping completed!"}
+    service = JobService(db)
+    job, created = await service.start_scrape_job()
+    message = "Scraping started!" if created else "Scraping is already in progress."
+    return {"message": message, **service.serialize(job)}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+        job_id: str,
+        db: AsyncIOMotorDatabase = Depends(get_mongo_database)
+):
+    service = JobService(db)
+    job = await service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return service.serialize(job)
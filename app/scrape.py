@@ -1,9 +1,17 @@
 import asyncio
 
+from app.api.http_client import http_client
+from app.api.kroger_api_client import KrogerAPIClient
 from app.config.logger_config import LoggerConfig
 from app.config.config import Config
 from app.db.mongo_db import mongodb_client
-from app.services.scrap_service import ScrapService
+from app.repositories.freshness_repository import FreshnessRepository
+from app.repositories.ingredient_frontier_repository import IngredientFrontierRepository
+from app.repositories.job_repository import JobRepository
+from app.repositories.mongo_repository import MongoRepository
+from app.repositories.price_summary_repository import PriceSummaryRepository
+from app.repositories.token_repository import TokenRepository
+from app.services.job_service import JobService
 
 logger = LoggerConfig.get_logger()
 
@@ -11,11 +19,28 @@ async def run_scraping():
     logger.info("Connecting to MongoDB...")
     await mongodb_client.connect()
 
-    db = await mongodb_client.get_client()
+    db = mongodb_client.get_client()
     database = db[Config.MONGO_DB_NAME]
+    await MongoRepository(database).ensure_indexes()
+    await JobRepository(database).ensure_indexes()
+    await FreshnessRepository(database).ensure_indexes()
+    await IngredientFrontierRepository(database).ensure_indexes()
+    await PriceSummaryRepository(database).ensure_indexes()
+    if Config.KROGER_TOKEN_STORE == "mongo":
+        # Reuses the token the API workers (or the previous run) already fetched
+        KrogerAPIClient.use_token_store(TokenRepository(database))
 
-    service = ScrapService(database)
-    await service.start_scraping()
+    # Registered as a job so that overlapping cron runs and API-triggered scrapes coalesce
+    service = JobService(database)
+    job, created = await service.create_scrape_job()
+    if not created:
+        logger.warning(f"Scrape job {job['_id']} is already in progress. Skipping this run.")
+    else:
+        await http_client.start()
+        try:
+            await service.run_scrape_job(job["_id"])
+        finally:
+            await http_client.close()
 
     logger.info("Scraping completed. Closing MongoDB connection.")
     await mongodb_client.close()
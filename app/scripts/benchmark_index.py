@@ -0,0 +1,103 @@
+"""
+Compares FAISS index types for ingredient matching: build time, query latency and recall
+against the exact (flat) index.
+
+Vectors are synthetic by default (clustered and normalized like sentence embeddings), so the
+benchmark runs without MongoDB or the transformer model; set VECTORS_FILE to the cached
+ingredient vectors (.cache/ingredient_index/vectors.npy) to benchmark on real data.
+
+Run: python -m app.scripts.benchmark_index
+"""
+
+import time
+
+import numpy as np
+
+from app.matching.index_factory import build_index, configure_search, prepare_vectors
+
+# Manual configuration parameters
+VECTORS_FILE = ""
+DIMENSION = 384
+DATABASE_SIZE = 50_000
+QUERY_COUNT = 1_000
+CLUSTERS = 500
+TOP_K = 10
+METRIC = "ip"
+# (label, index type, build options, search options)
+CONFIGURATIONS = [
+    ("flat", "flat", {}, {}),
+    ("ivf nprobe=1", "ivf", {}, {"nprobe": 1}),
+    ("ivf nprobe=8", "ivf", {}, {"nprobe": 8}),
+    ("ivf nprobe=32", "ivf", {}, {"nprobe": 32}),
+    ("hnsw M=32 ef=32", "hnsw", {"hnsw_m": 32}, {"ef_search": 32}),
+    ("hnsw M=32 ef=64", "hnsw", {"hnsw_m": 32}, {"ef_search": 64}),
+    ("hnsw M=32 ef=128", "hnsw", {"hnsw_m": 32}, {"ef_search": 128}),
+]
+
+
+def make_vectors(count, dimension, clusters, seed=0):
+    """Returns clustered random vectors, so neighborhoods look like those of real embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    assignments = rng.integers(0, clusters, count)
+    return centers[assignments] + 0.5 * rng.standard_normal((count, dimension)).astype(np.float32)
+
+
+def make_queries(vectors, count, seed=1):
+    """Returns perturbed copies of random database vectors, like descriptions close to an ingredient."""
+    rng = np.random.default_rng(seed)
+    picked = vectors[rng.integers(0, len(vectors), count)]
+    return picked + 0.3 * rng.standard_normal(picked.shape).astype(np.float32)
+
+
+def recall_at(ids, true_ids, k):
+    """Share of the true k nearest neighbors found in the first k results."""
+    found = sum(len(set(row[:k]) & set(true_row[:k])) for row, true_row in zip(ids, true_ids))
+    return found / (len(true_ids) * k)
+
+
+def benchmark(vectors, queries, configurations=CONFIGURATIONS, metric=METRIC, top_k=TOP_K):
+    """
+    Builds every configuration and measures it against the flat index.
+
+    :return: One result dict per configuration.
+    """
+    vectors = prepare_vectors(vectors, metric)
+    queries = prepare_vectors(queries, metric)
+    _, true_ids = build_index(vectors, "flat", metric).search(queries, top_k)
+
+    results = []
+    for label, index_type, build_options, search_options in configurations:
+        start_time = time.time()
+        index = build_index(vectors, index_type, metric, **build_options)
+        build_time = time.time() - start_time
+        configure_search(index, **search_options)
+
+        start_time = time.time()
+        _, ids = index.search(queries, top_k)
+        search_time = time.time() - start_time
+
+        results.append({
+            "label": label,
+            "build_sec": build_time,
+            "query_ms": 1000 * search_time / len(queries),
+            "recall@1": recall_at(ids, true_ids, 1),
+            f"recall@{top_k}": recall_at(ids, true_ids, top_k),
+        })
+    return results
+
+
+# Run the script manually
+if __name__ == "__main__":
+    if VECTORS_FILE:
+        database = np.load(VECTORS_FILE)
+        print(f"[INFO] Loaded {len(database)} vectors from {VECTORS_FILE}")
+    else:
+        database = make_vectors(DATABASE_SIZE, DIMENSION, CLUSTERS)
+        print(f"[INFO] Generated {len(database)} synthetic vectors of dimension {DIMENSION}")
+    query_vectors = make_queries(database, QUERY_COUNT)
+
+    print(f"{'index':<20}{'build, s':>10}{'query, ms':>11}{'recall@1':>10}{f'recall@{TOP_K}':>11}")
+    for result in benchmark(database, query_vectors):
+        print(f"{result['label']:<20}{result['build_sec']:>10.2f}{result['query_ms']:>11.3f}"
+              f"{result['recall@1']:>10.3f}{result[f'recall@{TOP_K}']:>11.3f}")
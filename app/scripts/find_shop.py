@@ -63,4 +63,7 @@ def find_kroger_stores(filename, city=None, state=None, largest_cities=None):
 
 # Run script with fixed parameters
 if __name__ == "__main__":
-    find_kroger_stores(FILENAME, CITY, STATE, LARGEST_CITIES)
+    stores = find_kroger_stores(FILENAME, CITY, STATE, LARGEST_CITIES)
+    if stores:
+        # Ready to paste into .env to scrape all of them in one run
+        print(f"KROGER_API_LOCATION_IDS={','.join(store['locationId'] for store in stores)}")
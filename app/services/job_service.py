@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timedelta, UTC
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+from app.repositories.job_repository import JobRepository
+from app.services.scrap_service import ScrapService
+
+logger = LoggerConfig.get_logger()
+
+
+class JobService:
+    SCRAPE = "scrape"
+
+    # Jobs running in this process; keeps a reference so the tasks are not garbage collected
+    _tasks: set[asyncio.Task] = set()
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.repository = JobRepository(db)
+
+    async def create_scrape_job(self) -> tuple[dict, bool]:
+        """
+        Registers a scrape job, coalescing with the one already in progress.
+
+        :return: The job and whether it was newly created.
+        """
+        for _ in range(2):
+            try:
+                return await self.repository.create(self.SCRAPE), True
+            except DuplicateKeyError:
+                job = await self.repository.find_active(self.SCRAPE)
+                if job is None:
+                    # Finished between our insert and lookup
+                    continue
+                if not self._is_stale(job):
+                    return job, False
+                # The process running it died without finishing it
+                logger.warning(f"Scrape job {job['_id']} has not reported progress in time, marking it as failed.")
+                await self.repository.finish(job["_id"], JobRepository.FAILED, "Job went stale")
+
+        return await self.repository.create(self.SCRAPE), True
+
+    @staticmethod
+    def _is_stale(job: dict) -> bool:
+        updated_at = job["updated_at"]
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=UTC)
+        return datetime.now(UTC) - updated_at > timedelta(seconds=Config.JOB_STALE_AFTER_SECONDS)
+
+    async def start_scrape_job(self) -> tuple[dict, bool]:
+        """
+        Starts a scrape job in the background of this process.
+
+        :return: The job and whether it was newly created.
+        """
+        job, created = await self.create_scrape_job()
+        if created:
+            task = asyncio.create_task(self.run_scrape_job(job["_id"]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return job, created
+
+    async def run_scrape_job(self, job_id: str) -> None:
+        """Runs the scrape for a registered job, recording its progress and outcome."""
+        await self.repository.mark_running(job_id)
+
+        async def on_progress(stats: dict):
+            await self.repository.update_progress(job_id, stats)
+
+        try:
+            logger.info(f"Scrape job {job_id} started.")
+            await ScrapService(self.db, on_progress=on_progress).start_scraping()
+        except asyncio.CancelledError:
+            await self.repository.finish(job_id, JobRepository.FAILED, "Job was cancelled")
+            raise
+        except Exception as e:
+            logger.error(f"Scrape job {job_id} failed: {e}")
+            await self.repository.finish(job_id, JobRepository.FAILED, str(e))
+        else:
+            logger.info(f"Scrape job {job_id} completed.")
+            await self.repository.finish(job_id, JobRepository.COMPLETED)
+
+    async def get_job(self, job_id: str) -> dict | None:
+        return await self.repository.get(job_id)
+
+    @classmethod
+    async def cancel_running_jobs(cls) -> None:
+        """Cancels the jobs running in this process, e.g. on shutdown."""
+        for task in list(cls._tasks):
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+
+    @staticmethod
+    def serialize(job: dict) -> dict:
+        """Converts a job document into an API response."""
+        return {
+            "job_id": job["_id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "progress": job.get("progress", {}),
+            "error": job.get("error"),
+            "created_at": job["created_at"],
+            "started_at": job.get("started_at"),
+            "finished_at": job.get("finished_at"),
+            "updated_at": job["updated_at"],
+        }
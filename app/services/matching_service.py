@@ -0,0 +1,156 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class MatchingService:
+    """
+    Serves ingredient matching from a model and index kept warm in memory.
+
+    Requests are queued and merged into micro-batches: one model call serves every request
+    that arrived within MATCHING_MAX_BATCH_WAIT, which is much cheaper than one call each.
+    Inference runs in a worker thread, so the event loop is never blocked.
+    """
+
+    def __init__(self):
+        self.matcher = None
+        self.max_batch_size = 256
+        self.max_batch_wait = 0.01
+        self._queue: asyncio.Queue | None = None
+        self._batcher: asyncio.Task | None = None
+        # A single thread: the model already uses every core for one batch
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._batcher is not None
+
+    async def load(self, db: AsyncIOMotorDatabase) -> None:
+        """
+        Loads the model and the ingredient index, if matching is enabled and its dependencies are installed.
+
+        Never raises: if loading fails, matching stays disabled.
+        """
+        if not Config.MATCHING_ENABLED:
+            return
+        try:
+            from app.matching.ingredient_matcher import create_matcher
+        except ImportError as e:
+            logger.warning(f"Ingredient matching is disabled, missing dependency: {e}")
+            return
+
+        try:
+            ingredient_names = await db[Config.MONGO_INGREDIENTS_COLLECTION_NAME].distinct("name")
+            logger.info(f"Loading the matching model and index for {len(ingredient_names)} ingredients...")
+            matcher = await asyncio.to_thread(create_matcher, ingredient_names)
+        except Exception as e:
+            # Matching is optional: the rest of the API starts anyway and /match answers 503
+            logger.error(f"Ingredient matching is disabled, could not load it: {e}")
+            return
+        self.start(matcher, Config.MATCHING_MAX_BATCH_SIZE, Config.MATCHING_MAX_BATCH_WAIT)
+        logger.info("Ingredient matching is ready")
+
+    def start(self, matcher, max_batch_size: int = None, max_batch_wait: float = None) -> None:
+        """
+        Starts serving requests with a loaded matcher.
+
+        :param matcher: IngredientMatcher (anything with match(descriptions) and accept(candidates)).
+        :param max_batch_size: Max descriptions merged into one model call.
+        :param max_batch_wait: Max seconds a request waits for others to join its batch.
+        """
+        self.matcher = matcher
+        self.max_batch_size = max_batch_size or self.max_batch_size
+        self.max_batch_wait = max_batch_wait if max_batch_wait is not None else self.max_batch_wait
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="matching")
+        self._batcher = asyncio.create_task(self._run_batches())
+
+    async def stop(self) -> None:
+        if self._batcher is None:
+            return
+        self._batcher.cancel()
+        await asyncio.gather(self._batcher, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Ingredient matching stopped"))
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._batcher = None
+        self._queue = None
+        self._executor = None
+        self.matcher = None
+
+    async def match(self, descriptions: list) -> list:
+        """
+        Matches descriptions to ingredients.
+
+        :return: For every description: the accepted ingredient_name and score (None below
+                 the acceptance threshold) and all candidates.
+        """
+        if not self.is_running:
+            raise RuntimeError("Ingredient matching is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((descriptions, future))
+        candidates = await future
+        results = []
+        for description, top in zip(descriptions, candidates):
+            best = self.matcher.accept(top) or {}
+            results.append({
+                "description": description,
+                "ingredient_name": best.get("ingredient_name"),
+                "score": best.get("score"),
+                "candidates": top,
+            })
+        return results
+
+    async def _next_batch(self) -> list:
+        """Waits for a request, then collects others until the batch is full or the wait is over."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + self.max_batch_wait
+        while size < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(request)
+            size += len(request[0])
+        return batch
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            descriptions = [description for request, _ in batch for description in request]
+            try:
+                candidates = await loop.run_in_executor(self._executor, self.matcher.match, descriptions)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"Ingredient matching failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for request, future in batch:
+                # The caller may have gone away (e.g. client disconnected)
+                if not future.done():
+                    future.set_result(candidates[offset:offset + len(request)])
+                offset += len(request)
+
+
+matching_service = MatchingService()
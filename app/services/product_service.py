@@ -0,0 +1,98 @@
+import base64
+import json
+import re
+from datetime import datetime
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.repositories.mongo_repository import MongoRepository
+from app.repositories.price_summary_repository import PriceSummaryRepository
+
+
+class ProductService:
+    # Returned when the request does not pick fields; leaves out the bulky Kroger payload (items, images, ...)
+    DEFAULT_FIELDS = ["productId", "locationId", "ingredient_name", "description", "brand", "price",
+                      "match_score", "source_id", "date"]
+
+    _FIELD_PATTERN = re.compile(r"^[A-Za-z_][\w.]*$")
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.repository = MongoRepository(db)
+        self.price_summary_repository = PriceSummaryRepository(db)
+
+    @staticmethod
+    def encode_cursor(product: dict) -> str:
+        """Returns an opaque cursor pointing after the product."""
+        date = product.get("date")
+        payload = {"date": date.isoformat() if date else None, "id": str(product["_id"])}
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple:
+        """
+        Returns the (date, _id) a cursor points after.
+
+        :raises ValueError: If the cursor was not returned by encode_cursor().
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            date = datetime.fromisoformat(payload["date"]) if payload["date"] else None
+            product_id = payload["id"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+        return date, ObjectId(product_id) if ObjectId.is_valid(product_id) else product_id
+
+    @classmethod
+    def parse_fields(cls, fields: str | None) -> list:
+        """
+        Returns the requested fields ("a,b.c"), or the default ones.
+
+        :raises ValueError: If a field name is not a plain (dotted) field path, or a field is requested
+                            together with one of its subfields.
+        """
+        if not fields:
+            return cls.DEFAULT_FIELDS
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        invalid = [name for name in names if not cls._FIELD_PATTERN.match(name)]
+        if invalid:
+            raise ValueError(f"Invalid fields: {', '.join(invalid)}")
+        # MongoDB rejects a projection with a field and one of its subfields (path collision);
+        # _id and date are always projected
+        projected = set(names) | {"_id", "date"}
+        overlapping = sorted({name for name in projected for other in names if other.startswith(f"{name}.")})
+        if overlapping:
+            raise ValueError(f"Fields overlap with their subfields: {', '.join(overlapping)}")
+        return list(dict.fromkeys(names))
+
+    @staticmethod
+    def serialize(product: dict) -> dict:
+        """Converts a product document into an API response."""
+        product = dict(product)
+        product["id"] = str(product.pop("_id"))
+        return product
+
+    async def list_products(self, cursor: str = None, fields: str = None, limit: int = 50, **filters) -> dict:
+        """
+        Returns a page of products newest first and the cursor of the next page (None on the last page).
+
+        :param cursor: next_cursor of the previous page.
+        :param fields: Comma-separated fields to return.
+        :param limit: Max products on the page.
+        :param filters: Filters of MongoRepository.find_products().
+        :raises ValueError: If the cursor or the fields are invalid.
+        """
+        after = self.decode_cursor(cursor) if cursor else None
+        # One extra product tells whether there is a next page
+        products = await self.repository.find_products(fields=self.parse_fields(fields), after=after,
+                                                       limit=limit + 1, **filters)
+        next_cursor = self.encode_cursor(products[limit - 1]) if len(products) > limit else None
+        return {"items": [self.serialize(product) for product in products[:limit]], "next_cursor": next_cursor}
+
+    async def get_product(self, product_id: str, location_id: str = None) -> list:
+        """Returns the product as stored for every store (or only the given store)."""
+        return [self.serialize(product) for product in await self.repository.find_product(product_id, location_id)]
+
+    async def list_price_summaries(self, ingredient_name: str = None, location_id: str = None) -> list:
+        """Returns the price summaries per (ingredient, store), cheapest store first."""
+        return await self.price_summary_repository.find(ingredient_name, location_id)
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable
+
+from app.config.config import Config
+from app.config.logger_config import LoggerConfig
+
+logger = LoggerConfig.get_logger()
+
+
+class ScrapScheduler:
+    """Runs scraping jobs through a fixed-size pool of workers."""
+
+    def __init__(self, max_concurrency: int = None):
+        """
+        :param max_concurrency: Max number of jobs running at the same time.
+        """
+        self.max_concurrency = max(max_concurrency or Config.SCRAPER_MAX_CONCURRENCY, 1)
+
+    async def run(self, items: Iterable, job: Callable[[Any], Awaitable]) -> list:
+        """
+        Runs `job` for every item with at most `max_concurrency` jobs in flight.
+
+        Items are pulled from `items` lazily, one whenever a worker is free, so a generator of
+        items is never materialized up front.
+
+        :param items: Job arguments.
+        :param job: Coroutine function called with each item.
+        :return: Job results (or raised exceptions) in the order of `items`.
+        """
+        # Shared by the workers: an item is only taken from `items` when a worker is free for it
+        positioned_items = enumerate(items)
+        results = []
+
+        async def worker():
+            for position, item in positioned_items:
+                results.append(None)
+                try:
+                    results[position] = await job(item)
+                except Exception as e:
+                    logger.error(f"Scheduled job for '{item}' failed: {e}")
+                    results[position] = e
+
+        await asyncio.gather(*(worker() for _ in range(self.max_concurrency)))
+        return results
@@ -1,12 +1,21 @@
-import asyncio
+import copy
+import hashlib
+import json
+from typing import AsyncIterator, Awaitable, Callable
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo.errors import PyMongoError
 from fastapi import HTTPException
 
 from app.api.kroger_api_client import KrogerAPIClient
 from app.api.spoonacular_api_client import SpoonacularAPIClient
+from app.config.config import Config
 from app.config.logger_config import LoggerConfig
+from app.repositories.freshness_repository import FreshnessRepository
+from app.repositories.ingredient_frontier_repository import IngredientFrontierRepository
 from app.repositories.mongo_repository import MongoRepository
+from app.repositories.price_summary_repository import PriceSummaryRepository
+from app.services.scrap_scheduler import ScrapScheduler
 
 logger = LoggerConfig.get_logger()
 
@@ -14,19 +23,77 @@ logger = LoggerConfig.get_logger()
 
 
 class ScrapService:
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, on_progress: Callable[[dict], Awaitable] = None,
+                 location_ids: list = None):
+        """
+        :param db: MongoDB database.
+        :param on_progress: Optional coroutine function called with a copy of `stats` after each ingredient.
+        :param location_ids: Stores to scrape: ids or store dicts as returned by find_kroger_stores.
+                             Defaults to Config.KROGER_API_LOCATION_IDS.
+        """
         self.repository = MongoRepository(db)
+        self.freshness_repository = FreshnessRepository(db)
+        self.frontier_repository = IngredientFrontierRepository(db)
+        self.price_summary_repository = PriceSummaryRepository(db)
         self.spoonacular_client = SpoonacularAPIClient()
+        self.scheduler = ScrapScheduler()
+        self.on_progress = on_progress
+        self.location_ids = self.normalize_location_ids(location_ids or Config.KROGER_API_LOCATION_IDS)
+        # Ingredient counters count (ingredient, store) pairs; fresh pairs that were not re-scraped
+        # count as done and as fresh
+        self.stats = {
+            "ingredients_total": 0,
+            "ingredients_done": 0,
+            "ingredients_failed": 0,
+            "ingredients_fresh": 0,
+            "inserted": 0,
+            "modified": 0,
+            "unchanged": 0,
+            "stores": {location_id: self._new_store_stats() for location_id in self.location_ids},
+        }
+        # Ingredients whose stored products changed, so their price summaries need a refresh
+        self.touched_ingredients = set()
+
+    @staticmethod
+    def _new_store_stats() -> dict:
+        return {"done": 0, "failed": 0, "fresh": 0, "inserted": 0, "modified": 0, "unchanged": 0}
+
+    @staticmethod
+    def normalize_location_ids(locations: list) -> list:
+        """Returns unique store ids, in order, from ids or find_kroger_stores store dicts."""
+        location_ids = [location["locationId"] if isinstance(location, dict) else str(location)
+                        for location in locations]
+        return list(dict.fromkeys(location_ids))
 
     async def start_scraping(self):
         logger.info("Starting Spoonacular scraping process...")
-        ingredients = await self.fetch_ingredients_from_spoonacular()
+        from_frontier = Config.SCRAPE_INGREDIENT_SOURCE == "frontier"
+        if from_frontier:
+            ingredients = await self.draw_from_frontier()
+        else:
+            ingredients = await self.fetch_ingredients_from_spoonacular()
 
         if not ingredients:
             logger.warning("No ingredients found. Stopping process.")
             return
 
         await self.process_ingredients(ingredients)
+        if from_frontier:
+            # Failed pairs come back when the frontier cycles around
+            await self.frontier_repository.mark_scraped(list(ingredients))
+        await self.refresh_price_summaries()
+
+    async def draw_from_frontier(self) -> set:
+        """Adds the ingredients of new random recipes to the frontier and takes the next batch to scrape."""
+        try:
+            discovered = await self.fetch_ingredients_from_spoonacular()
+            added = await self.frontier_repository.add_many(discovered)
+            logger.info(f"Added {added} new ingredients to the frontier.")
+        except HTTPException as e:
+            # The frontier still has work even when Spoonacular is out of quota
+            logger.warning(f"Could not discover new ingredients, scraping the frontier only: {e.detail}")
+
+        return set(await self.frontier_repository.take_batch(Config.SCRAPE_FRONTIER_BATCH_SIZE))
 
     async def fetch_ingredients_from_spoonacular(self) -> set:
         try:
@@ -42,7 +109,7 @@ class ScrapService:
                 for ingredient in recipe.get("extendedIngredients", []):
                     ingredients.add(ingredient["name"])
 
-            logger.info(f"Extracted {len(ingredients)} unique ingredients.")
+            logger.info(f"Extracted {len(ingredients)} unique ingredients from {len(recipe_data['recipes'])} recipes.")
             return ingredients
 
         except HTTPException as e:
@@ -54,28 +121,118 @@ class ScrapService:
             raise HTTPException(status_code=500, detail="Error fetching ingredients from Spoonacular")
 
     async def process_ingredients(self, ingredients: set):
-        tasks = [self.fetch_from_kroger(ingredient) for ingredient in ingredients]
-        await asyncio.gather(*tasks)
-
-    async def fetch_from_kroger(self, ingredient_name: str):
+        """Scrapes every ingredient in every store; all pairs share one bounded pool of workers."""
+        pairs = [(ingredient, location_id) for ingredient in ingredients for location_id in self.location_ids]
+        self.stats["ingredients_total"] += len(pairs)
+        await self.report_progress()
+        await self.scheduler.run(pairs, lambda pair: self.fetch_from_kroger(*pair))
+
+    async def report_progress(self):
+        if self.on_progress is None:
+            return
         try:
-            logger.info(f"Fetching ingredient '{ingredient_name}' from Kroger API...")
-            kroger_client = KrogerAPIClient(ingredient_name)
-            products = await kroger_client.fetch_all_products_with_pagination()
-
-            if not products:
-                logger.warning(f"No products found for '{ingredient_name}'. Skipping.")
-                return
+            await self.on_progress(copy.deepcopy(self.stats))
+        except Exception as e:
+            # Progress reporting must never break the scrape itself
+            logger.warning(f"Failed to report scraping progress: {e}")
 
-            await self.save_to_database(products, ingredient_name)
+    async def fetch_from_kroger(self, ingredient_name: str, location_id: str = None):
+        location_id = location_id or self.location_ids[0]
+        store_stats = self.stats["stores"].setdefault(location_id, self._new_store_stats())
+        try:
+            scraped = await self.scrape_if_stale(ingredient_name, location_id, store_stats)
+            self.stats["ingredients_done"] += 1
+            store_stats["done"] += 1
+            if not scraped:
+                self.stats["ingredients_fresh"] += 1
+                store_stats["fresh"] += 1
 
         except Exception as e:
-            logger.error(f"Error processing ingredient '{ingredient_name}': {e}")
+            logger.error(f"Error processing ingredient '{ingredient_name}' in store {location_id}: {e}")
+            self.stats["ingredients_failed"] += 1
+            store_stats["failed"] += 1
+
+        await self.report_progress()
+
+    @staticmethod
+    def page_hash(products: list) -> str:
+        """Content hash of a page of products, used to tell whether a store's results changed."""
+        return hashlib.sha1(json.dumps(products, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    async def _prepend(first_page: list, pages: AsyncIterator[list]):
+        if first_page:
+            yield first_page
+        async for page in pages:
+            yield page
+
+    async def scrape_if_stale(self, ingredient_name: str, location_id: str, store_stats: dict) -> bool:
+        """
+        Scrapes an ingredient in a store unless it was fully scraped within Config.SCRAPE_FRESHNESS_TTL_SECONDS.
+
+        A fresh pair is skipped ("skip" mode) or has only its first page fetched ("sample" mode):
+        if that page changed since the last full scrape, the remaining pages are fetched too.
+
+        :return: Whether the pair was scraped, False if it was fresh.
+        """
+        fresh = None
+        if Config.SCRAPE_FRESHNESS_TTL_SECONDS > 0:
+            fresh = await self.freshness_repository.find_fresh(
+                ingredient_name, location_id, Config.SCRAPE_FRESHNESS_TTL_SECONDS
+            )
+        if fresh and Config.SCRAPE_FRESH_MODE == "skip":
+            logger.info(f"Ingredient '{ingredient_name}' in store {location_id} is fresh. Skipping.")
+            return False
+
+        logger.info(f"Fetching ingredient '{ingredient_name}' from Kroger API (store {location_id})...")
+        kroger_client = KrogerAPIClient(ingredient_name, location_id)
+        pages = kroger_client.iter_product_pages()
+        first_page = await anext(pages, [])
+        first_page_hash = self.page_hash(first_page)
+
+        if fresh and fresh.get("first_page_hash") == first_page_hash:
+            # Nothing changed on page 1: the remaining pages are not requested
+            await pages.aclose()
+            await self.freshness_repository.mark_checked(ingredient_name, location_id)
+            logger.info(f"Ingredient '{ingredient_name}' in store {location_id} is unchanged. Skipping.")
+            return False
+
+        counts = await self.save_to_database(
+            self._prepend(first_page, pages), ingredient_name, location_id
+        )
+        await self.freshness_repository.mark_scraped(ingredient_name, location_id, sum(counts.values()),
+                                                     first_page_hash)
+
+        if not sum(counts.values()):
+            logger.warning(f"No products found for '{ingredient_name}' in store {location_id}. Skipping.")
+
+        for key, value in counts.items():
+            self.stats[key] += value
+            store_stats[key] += value
+        if counts["inserted"] or counts["modified"]:
+            self.touched_ingredients.add(ingredient_name)
+        return True
+
+    async def refresh_price_summaries(self):
+        """Recomputes the price summaries of the ingredients this run changed."""
+        if not self.touched_ingredients:
+            return
+        try:
+            await self.price_summary_repository.refresh(self.touched_ingredients)
+        except PyMongoError as e:
+            # The products are saved; the summaries catch up on the next run touching these ingredients
+            logger.error(f"Could not refresh price summaries: {e}")
 
-    async def save_to_database(self, products: list, ingredient_name: str):
+    async def save_to_database(self, pages: AsyncIterator[list], ingredient_name: str, location_id: str) -> dict:
         try:
-            count = await self.repository.save_ingredients(products, ingredient_name, "spoonacular")
-            logger.info(f"Successfully saved {count} products for '{ingredient_name}'.")
+            previous_ingredients = set()
+            counts = await self.repository.save_ingredient_pages(pages, ingredient_name, "spoonacular", location_id,
+                                                                 previous_ingredients)
+            # Products found by this search were moved away from these ingredients, shrinking their summaries
+            self.touched_ingredients.update(previous_ingredients)
+            if sum(counts.values()):
+                logger.info(f"Successfully saved products for '{ingredient_name}': {counts}.")
+            return counts
 
         except PyMongoError as e:
             logger.error(f"MongoDB error while saving '{ingredient_name}': {e}")
@@ -0,0 +1,62 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.api.api_key_pool import ApiKeyPool, NoApiKeyAvailable
+from app.api.spoonacular_api_client import SpoonacularAPIClient
+
+
+def test_acquire_picks_key_with_most_quota_left():
+    pool = ApiKeyPool(["alpha-key", "bravo-key"])
+    keys = {pool.acquire(), pool.acquire()}
+    pool.release("alpha-key", 200, {"X-API-Quota-Left": "10"})
+    pool.release("bravo-key", 200, {"X-API-Quota-Left": "90"})
+
+    assert keys == {"alpha-key", "bravo-key"}
+    assert pool.acquire() == "bravo-key"
+
+
+def test_exhausted_key_is_on_cooldown_until_reset():
+    pool = ApiKeyPool(["alpha-key", "bravo-key"])
+    first = pool.acquire()
+    pool.release(first, 402, {"X-API-Quota-Left": "0"})
+
+    second = pool.acquire()
+    pool.release(second, 429, {"Retry-After": "30"})
+
+    with pytest.raises(NoApiKeyAvailable) as error:
+        pool.acquire()
+    assert 0 < error.value.retry_in <= 30
+    snapshot = {state["key"]: state for state in pool.snapshot()}
+    assert snapshot[ApiKeyPool.mask(first)]["exhausted"] == 1
+    assert snapshot[ApiKeyPool.mask(second)]["cooldown_seconds"] > 0
+
+
+def test_snapshot_masks_keys():
+    pool = ApiKeyPool(["secret-key"])
+
+    assert pool.snapshot()[0]["key"] == "secr..."
+
+
+def _response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers, json={"recipes": []},
+                          request=httpx.Request("GET", "https://api.spoonacular.com/recipes/random"))
+
+
+@pytest.mark.asyncio
+@patch("app.api.spoonacular_api_client.SpoonacularAPIClient.key_pool", ApiKeyPool(["key-a", "key-b"]))
+@patch("httpx.AsyncClient")
+async def test_spoonacular_client_moves_to_next_key_without_sleeping(mock_async_client):
+    mock_client = MagicMock()
+    mock_client.__aenter__.return_value = mock_client
+    mock_client.__aexit__.return_value = None
+    mock_client.get = AsyncMock(side_effect=[_response(402, {"X-API-Quota-Left": "0"}), _response(200)])
+    mock_async_client.return_value = mock_client
+
+    result = await SpoonacularAPIClient().fetch_random_recipe(number=100)
+
+    assert result == {"recipes": []}
+    used_keys = [call.kwargs["params"]["apiKey"] for call in mock_client.get.await_args_list]
+    assert len(set(used_keys)) == 2
+    assert mock_client.get.await_args.kwargs["params"]["number"] == 100
@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.matching.description_cache import DescriptionCache
+
+
+def _entry(match):
+    return {"vector": np.ones(3, dtype=np.float32), "match": match, "index_hash": "v1"}
+
+
+def test_key_ignores_case_and_whitespace():
+    cache = DescriptionCache("model")
+
+    assert cache.key("  Kroger  Whole Milk ") == cache.key("kroger whole milk")
+    assert cache.key("kroger whole milk") != DescriptionCache("other-model").key("kroger whole milk")
+
+
+def test_get_many_counts_hits_and_misses():
+    cache = DescriptionCache("model")
+    milk, egg = cache.key("milk"), cache.key("egg")
+    cache.put_many({milk: _entry("milk")})
+
+    found = cache.get_many([milk, egg, milk])
+
+    assert list(found) == [milk]
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+    assert cache.hit_rate() == 0.5
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = DescriptionCache("model", max_size=2)
+    milk, egg, butter = cache.key("milk"), cache.key("egg"), cache.key("butter")
+    cache.put_many({milk: _entry("milk"), egg: _entry("egg")})
+
+    # Touch milk so egg becomes the least recently used
+    cache.get_many([milk])
+    cache.put_many({butter: _entry("butter")})
+
+    assert set(cache.get_many([milk, egg, butter])) == {milk, butter}
+    assert cache.stats["evictions"] == 1
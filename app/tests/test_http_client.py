@@ -0,0 +1,44 @@
+import pytest
+import pytest_asyncio
+
+from app.api.http_client import http_client
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def close_shared_client():
+    yield
+    await http_client.close()
+
+
+@pytest.mark.asyncio
+async def test_session_reuses_shared_client():
+    await http_client.start()
+
+    async with http_client.session() as first:
+        pass
+    async with http_client.session() as second:
+        pass
+
+    assert first is second is http_client.get_client()
+    assert not first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_session_without_shared_client_is_short_lived():
+    assert http_client.get_client() is None
+
+    async with http_client.session() as client:
+        assert not client.is_closed
+
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_close_resets_shared_client():
+    await http_client.start()
+    client = http_client.get_client()
+
+    await http_client.close()
+
+    assert client.is_closed
+    assert http_client.get_client() is None
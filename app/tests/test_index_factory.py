@@ -0,0 +1,50 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+
+from app.matching.index_factory import build_index, configure_search, prepare_vectors
+
+
+def _vectors(count=400, dimension=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((count, dimension)).astype(np.float32)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf", "hnsw"])
+@pytest.mark.parametrize("metric", ["l2", "ip"])
+def test_build_index_finds_indexed_vectors(index_type, metric):
+    vectors = prepare_vectors(_vectors(), metric)
+
+    index = build_index(vectors, index_type, metric, nprobe=64)
+    _, ids = index.search(vectors[:20], 1)
+
+    assert index.ntotal == len(vectors)
+    assert list(ids[:, 0]) == list(range(20))
+
+
+def test_prepare_vectors_normalizes_for_inner_product():
+    vectors = _vectors(count=5)
+
+    prepared = prepare_vectors(vectors, "ip")
+
+    assert np.allclose(np.linalg.norm(prepared, axis=1), 1.0)
+    # The caller's vectors are left untouched
+    assert not np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+
+
+def test_build_index_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        build_index(_vectors(), "lsh")
+
+
+def test_configure_search_sets_query_parameters():
+    vectors = _vectors()
+    ivf = build_index(vectors, "ivf", nlist=10)
+    hnsw = build_index(vectors, "hnsw")
+
+    configure_search(ivf, nprobe=100, ef_search=16)
+    configure_search(hnsw, nprobe=100, ef_search=16)
+
+    assert ivf.nprobe == 10
+    assert hnsw.hnsw.efSearch == 16
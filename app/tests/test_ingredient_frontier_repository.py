@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.repositories.ingredient_frontier_repository import IngredientFrontierRepository
+
+
+@pytest.fixture
+def mock_collection():
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock(return_value=MagicMock(upserted_count=2))
+    return collection
+
+
+@pytest.fixture
+def repository(mock_collection):
+    db = MagicMock()
+    db.__getitem__.return_value = mock_collection
+    return IngredientFrontierRepository(db)
+
+
+def test_normalize():
+    assert IngredientFrontierRepository.normalize("  Extra-Virgin   Olive Oil! ") == "extra-virgin olive oil"
+    assert IngredientFrontierRepository.normalize("baker's yeast") == "baker's yeast"
+
+
+@pytest.mark.asyncio
+async def test_add_many_deduplicates_normalized_names(repository, mock_collection):
+    added = await repository.add_many(["Milk", "milk ", "Eggs", "!!"])
+
+    operations, = mock_collection.bulk_write.await_args.args
+    assert added == 2
+    assert {operation._filter["_id"]: operation._doc["$inc"]["seen_count"] for operation in operations} == {
+        "milk": 2, "eggs": 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_add_many_without_names_does_not_write(repository, mock_collection):
+    assert await repository.add_many([]) == 0
+    mock_collection.bulk_write.assert_not_called()
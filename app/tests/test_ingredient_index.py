@@ -0,0 +1,90 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+
+from app.matching.ingredient_index import IngredientIndex
+
+
+class FakeModel:
+    """Deterministic stand-in for SentenceTransformer that records what it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, batch_size=64, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        return np.array([[len(text), sum(map(ord, text)) % 97, 1.0] for text in texts], dtype=np.float32)
+
+
+def test_load_builds_and_persists_index(tmp_path):
+    model = FakeModel()
+
+    ingredient_index = IngredientIndex(model, "fake-model", str(tmp_path)).load(["egg", "milk"])
+
+    assert model.encoded == ["egg", "milk"]
+    assert ingredient_index.index.ntotal == 2
+    assert (tmp_path / "index.faiss").exists()
+
+
+def test_load_reuses_cache_when_names_are_unchanged(tmp_path):
+    IngredientIndex(FakeModel(), "fake-model", str(tmp_path)).load(["egg", "milk"])
+    model = FakeModel()
+
+    ingredient_index = IngredientIndex(model, "fake-model", str(tmp_path)).load(["egg", "milk"])
+
+    assert model.encoded == []
+    assert ingredient_index.index.ntotal == 2
+
+
+def test_load_encodes_only_new_names(tmp_path):
+    IngredientIndex(FakeModel(), "fake-model", str(tmp_path)).load(["egg", "milk"])
+    model = FakeModel()
+
+    ingredient_index = IngredientIndex(model, "fake-model", str(tmp_path)).load(["butter", "egg", "milk"])
+
+    assert model.encoded == ["butter"]
+    assert ingredient_index.index.ntotal == 3
+    _, ids = ingredient_index.index.search(FakeModel().encode(["milk"]), 1)
+    assert ingredient_index.names[ids[0][0]] == "milk"
+
+
+def test_model_change_re_encodes(tmp_path):
+    IngredientIndex(FakeModel(), "fake-model", str(tmp_path)).load(["egg"])
+    model = FakeModel()
+
+    IngredientIndex(model, "other-model", str(tmp_path)).load(["egg"])
+
+    assert model.encoded == ["egg"]
+
+
+def test_index_type_change_rebuilds_without_re_encoding(tmp_path):
+    IngredientIndex(FakeModel(), "fake-model", str(tmp_path)).load(["egg", "milk"])
+    model = FakeModel()
+
+    ingredient_index = IngredientIndex(model, "fake-model", str(tmp_path), index_type="hnsw", metric="ip")
+    ingredient_index.load(["egg", "milk"])
+
+    assert model.encoded == []
+    assert ingredient_index.index.metric_type == faiss.METRIC_INNER_PRODUCT
+    _, ids = ingredient_index.search(FakeModel().encode(["milk"]), 1)
+    assert ingredient_index.names[ids[0][0]] == "milk"
+
+
+def test_top_matches_returns_ranked_candidates_with_scores(tmp_path):
+    ingredient_index = IngredientIndex(FakeModel(), "fake-model", str(tmp_path), metric="ip")
+    ingredient_index.load(["egg", "milk", "butter"])
+
+    [candidates] = ingredient_index.top_matches(FakeModel().encode(["milk"]), k=5)
+
+    assert len(candidates) == 3
+    assert candidates[0]["ingredient_name"] == "milk"
+    assert candidates[0]["score"] == pytest.approx(1.0, abs=1e-4)
+    assert [c["score"] for c in candidates] == sorted((c["score"] for c in candidates), reverse=True)
+
+
+def test_similarity_converts_l2_distance_to_cosine(tmp_path):
+    ingredient_index = IngredientIndex(FakeModel(), "fake-model", str(tmp_path), metric="l2")
+
+    # Unit vectors: identical (distance 0), orthogonal (2) and opposite (4)
+    assert list(ingredient_index.similarity([0.0, 2.0, 4.0])) == [1.0, 0.0, -1.0]
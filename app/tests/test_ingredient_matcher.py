@@ -0,0 +1,40 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("faiss")
+
+from app.matching.description_cache import DescriptionCache
+from app.matching.ingredient_index import IngredientIndex
+from app.matching.ingredient_matcher import IngredientMatcher
+from app.tests.test_ingredient_index import FakeModel
+
+
+@pytest.fixture
+def matcher(tmp_path):
+    model = FakeModel()
+    ingredient_index = IngredientIndex(model, "fake-model", str(tmp_path), metric="ip").load(["egg", "milk"])
+    model.encoded.clear()
+    return IngredientMatcher(model, ingredient_index, DescriptionCache("fake-model"), top_k=2, min_score=0.99)
+
+
+def test_match_encodes_each_description_once(matcher):
+    first = matcher.match(["milk", "milk"])
+    second = matcher.match(["milk"])
+
+    assert matcher.model.encoded == ["milk"]
+    assert first[0][0]["ingredient_name"] == "milk"
+    assert second == first[:1]
+
+
+def test_embed_uses_the_given_encoder(matcher):
+    encoded = []
+
+    def encode(texts):
+        encoded.extend(texts)
+        return FakeModel().encode(texts)
+
+    matches = matcher.search(matcher.embed(["egg"], encode=encode))
+
+    assert encoded == ["egg"]
+    assert matcher.model.encoded == []
+    assert matcher.accept(matches[0])["ingredient_name"] == "egg"
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, UTC
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.repositories.job_repository import JobRepository
+from app.services.job_service import JobService
+
+
+def _job(job_id, updated_at=None):
+    now = datetime.now(UTC)
+    return {"_id": job_id, "kind": "scrape", "status": "running", "created_at": now, "updated_at": updated_at or now}
+
+
+@pytest.fixture
+def service():
+    service = JobService(MagicMock())
+    service.repository = AsyncMock(spec=JobRepository)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_create_scrape_job(service):
+    service.repository.create.return_value = _job("new")
+
+    job, created = await service.create_scrape_job()
+
+    assert created is True
+    assert job["_id"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_create_scrape_job_coalesces_with_active_job(service):
+    service.repository.create.side_effect = DuplicateKeyError("duplicate")
+    service.repository.find_active.return_value = _job("running")
+
+    job, created = await service.create_scrape_job()
+
+    assert created is False
+    assert job["_id"] == "running"
+    service.repository.finish.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_scrape_job_replaces_stale_job(service):
+    stale = _job("stale", updated_at=datetime.now(UTC) - timedelta(days=1))
+    service.repository.create.side_effect = [DuplicateKeyError("duplicate"), _job("new")]
+    service.repository.find_active.return_value = stale
+
+    job, created = await service.create_scrape_job()
+
+    assert created is True
+    assert job["_id"] == "new"
+    service.repository.finish.assert_awaited_once_with("stale", JobRepository.FAILED, "Job went stale")
+
+
+@pytest.mark.asyncio
+@patch("app.services.job_service.ScrapService")
+async def test_run_scrape_job_records_failure(mock_scrap_service, service):
+    mock_scrap_service.return_value.start_scraping = AsyncMock(side_effect=Exception("Kroger is down"))
+
+    await service.run_scrape_job("job")
+
+    service.repository.mark_running.assert_awaited_once_with("job")
+    service.repository.finish.assert_awaited_once_with("job", JobRepository.FAILED, "Kroger is down")
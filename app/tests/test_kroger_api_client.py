@@ -1,3 +1,4 @@
+import asyncio
 import time
 import json
 from json.decoder import JSONDecodeError
@@ -46,6 +47,8 @@ def mock_product_response():
 @pytest.fixture(autouse=True)
 def reset_token_cache():
     KrogerAPIClient.token_cache = {"access_token": None, "expires_at": 0}
+    KrogerAPIClient._refresh_task = None
+    KrogerAPIClient.token_store = None
 
 
 @pytest.mark.asyncio
@@ -60,6 +63,68 @@ async def test_get_kroger_token_success(mock_client, mock_httpx_client):
     assert KrogerAPIClient.token_cache["expires_at"] > time.time()
 
 
+@pytest.mark.asyncio
+@patch("app.api.kroger_api_client.httpx.AsyncClient")
+async def test_get_kroger_token_valid_token_does_not_fetch(mock_client, mock_httpx_client):
+    mock_client.return_value = mock_httpx_client
+    KrogerAPIClient.token_cache = {"access_token": "cached", "expires_at": time.time() + 3600}
+
+    assert await KrogerAPIClient._get_kroger_token() == "cached"
+    mock_httpx_client.post.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.api.kroger_api_client.httpx.AsyncClient")
+async def test_get_kroger_token_concurrent_callers_share_one_fetch(mock_client, mock_httpx_client):
+    mock_client.return_value = mock_httpx_client
+
+    tokens = await asyncio.gather(*(KrogerAPIClient._get_kroger_token() for _ in range(10)))
+
+    assert tokens == ["test_token"] * 10
+    assert mock_httpx_client.post.await_count == 1
+
+
+@pytest.mark.asyncio
+@patch("app.api.kroger_api_client.httpx.AsyncClient")
+async def test_get_kroger_token_refreshes_in_background_before_expiry(mock_client, mock_httpx_client):
+    mock_client.return_value = mock_httpx_client
+    KrogerAPIClient.token_cache = {"access_token": "old_token", "expires_at": time.time() + 10}
+
+    # Still valid: returned right away while the replacement is fetched
+    assert await KrogerAPIClient._get_kroger_token() == "old_token"
+    await KrogerAPIClient._refresh_task
+
+    assert KrogerAPIClient.token_cache["access_token"] == "test_token"
+    assert mock_httpx_client.post.await_count == 1
+
+
+@pytest.mark.asyncio
+@patch("app.api.kroger_api_client.httpx.AsyncClient")
+async def test_get_kroger_token_uses_token_from_store(mock_client, mock_httpx_client):
+    mock_client.return_value = mock_httpx_client
+    store = AsyncMock()
+    store.get.return_value = {"access_token": "shared_token", "expires_at": time.time() + 3600}
+    KrogerAPIClient.use_token_store(store)
+
+    assert await KrogerAPIClient._get_kroger_token() == "shared_token"
+    mock_httpx_client.post.assert_not_called()
+    store.try_lease.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.api.kroger_api_client.httpx.AsyncClient")
+async def test_get_kroger_token_fetches_and_shares_when_store_is_empty(mock_client, mock_httpx_client):
+    mock_client.return_value = mock_httpx_client
+    store = AsyncMock()
+    store.get.return_value = None
+    store.try_lease.return_value = True
+    KrogerAPIClient.use_token_store(store)
+
+    assert await KrogerAPIClient._get_kroger_token() == "test_token"
+    store.save.assert_awaited_once()
+    assert store.save.await_args.args[1] == "test_token"
+
+
 @pytest.mark.asyncio
 @patch("app.api.kroger_api_client.httpx.AsyncClient")
 async def test_get_kroger_token_unauthorized(mock_client):
@@ -204,3 +269,92 @@ async def test_get_products_invalid_json(mock_get_token, mock_client, mock_kroge
 
     with pytest.raises(Exception, match="Invalid JSON response"):
         await mock_kroger_client._get_products()
+
+
+@pytest.mark.asyncio
+@patch("app.api.kroger_api_client.rate_limiter.backoff")
+@patch("app.api.kroger_api_client.httpx.AsyncClient")
+@patch.object(KrogerAPIClient, "_get_kroger_token", new_callable=AsyncMock)
+async def test_get_products_retries_after_rate_limit(mock_get_token, mock_client, mock_backoff,
+                                                     mock_kroger_client, mock_product_response):
+    mock_get_token.return_value = "test_token"
+
+    throttled = AsyncMock()
+    throttled.status_code = 429
+    throttled.headers = {"Retry-After": "1"}
+
+    ok = AsyncMock()
+    ok.status_code = 200
+    ok.json = AsyncMock(return_value=mock_product_response)
+
+    mock_instance = mock_client.return_value
+    mock_instance.__aenter__.return_value = mock_instance
+    mock_instance.get = AsyncMock(side_effect=[throttled, ok])
+
+    products = await mock_kroger_client._get_products()
+
+    assert products == mock_product_response
+    assert mock_instance.get.await_count == 2
+    mock_backoff.assert_called_once()
+    assert mock_backoff.call_args.args[1] == "1"
+
+
+def _page(start, total, duplicate_of=None):
+    products = [{"productId": str(start + i)} for i in range(50)]
+    if duplicate_of is not None:
+        products[0] = {"productId": str(duplicate_of)}
+    return {"data": products, "meta": {"pagination": {"total": total}}}
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_products_parallel(mock_kroger_client):
+    async def get_products(start=None):
+        start = mock_kroger_client.start if start is None else start
+        return _page(start, total=180, duplicate_of=1 if start == 101 else None)
+
+    with patch.object(mock_kroger_client, "_get_products", side_effect=get_products) as mock_get_products:
+        products = await mock_kroger_client.fetch_all_products_with_pagination(parallel=True)
+
+    assert [call.args for call in mock_get_products.call_args_list] == [(), (51,), (101,), (151,)]
+    # Product "1" from page 101 was already seen on the first page
+    assert len(products) == 199
+    assert [product["productId"] for product in products[:3]] == ["1", "2", "3"]
+    assert products[-1]["productId"] == "200"
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_products_parallel_caps_offsets(mock_kroger_client):
+    async def get_products(start=None):
+        start = mock_kroger_client.start if start is None else start
+        return _page(start, total=10000)
+
+    with patch.object(mock_kroger_client, "_get_products", side_effect=get_products) as mock_get_products:
+        products = await mock_kroger_client.fetch_all_products_with_pagination(parallel=True)
+
+    assert [call.args for call in mock_get_products.call_args_list] == [(), (51,), (101,), (151,), (201,)]
+    assert len(products) == 250
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_products_sequential(mock_kroger_client):
+    async def get_products(start=None):
+        return _page(mock_kroger_client.start, total=120)
+
+    with patch.object(mock_kroger_client, "_get_products", side_effect=get_products) as mock_get_products:
+        products = await mock_kroger_client.fetch_all_products_with_pagination(parallel=False)
+
+    assert mock_get_products.await_count == 3
+    assert len(products) == 150
+
+
+@pytest.mark.asyncio
+async def test_iter_product_pages_does_not_accumulate(mock_kroger_client):
+    async def get_products(start=None):
+        start = mock_kroger_client.start if start is None else start
+        return _page(start, total=150)
+
+    with patch.object(mock_kroger_client, "_get_products", side_effect=get_products):
+        pages = [page async for page in mock_kroger_client.iter_product_pages(parallel=True)]
+
+    assert [len(page) for page in pages] == [50, 50, 50]
+    assert mock_kroger_client.all_products == []
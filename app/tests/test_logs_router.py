@@ -0,0 +1,49 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.config.logger_config import LoggerConfig
+from app.handlers.web_socket_handler import log_broadcaster
+from app.routers.logs_router import router
+
+logger = LoggerConfig.get_logger()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    log_broadcaster.start(flush_interval=0.01)
+    yield
+    await log_broadcaster.stop()
+
+
+@pytest.fixture
+def client():
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(router, prefix="/ws")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_websocket_streams_filtered_logs(client):
+    with client.websocket_connect("/ws/logs?level=warning&ingredient=milk&replay=0") as websocket:
+        logger.info("Fetching ingredient 'milk' from Kroger API...")
+        logger.warning("No products found for 'egg'. Skipping.")
+        logger.warning("No products found for 'milk'. Skipping.")
+
+        assert websocket.receive_text().endswith("No products found for 'milk'. Skipping.")
+
+
+def test_websocket_replays_recent_logs(client):
+    logger.warning("Scraping completed!")
+
+    with client.websocket_connect("/ws/logs?replay=1") as websocket:
+        assert websocket.receive_text().endswith("Scraping completed!")
+
+
+def test_websocket_rejects_unknown_level(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/ws/logs?level=loud") as websocket:
+            websocket.receive_text()
@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from app.routers.match_router import router
+from app.services.matching_service import MatchingService, matching_service
+
+
+class FakeMatcher:
+    """Matches every description to itself and records the batches it was called with."""
+
+    def __init__(self):
+        self.calls = []
+
+    def match(self, descriptions):
+        self.calls.append(list(descriptions))
+        if "boom" in descriptions:
+            raise ValueError("model failure")
+        return [[{"ingredient_name": description, "score": 0.9 if description != "mystery" else 0.1}]
+                for description in descriptions]
+
+    def accept(self, candidates):
+        return candidates[0] if candidates and candidates[0]["score"] >= 0.5 else None
+
+
+@pytest_asyncio.fixture
+async def service():
+    service = MatchingService()
+    service.start(FakeMatcher(), max_batch_size=10, max_batch_wait=0.05)
+    yield service
+    await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_merged_into_one_batch(service):
+    results = await asyncio.gather(
+        service.match(["milk", "egg"]),
+        service.match(["butter"]),
+        service.match(["mystery"]),
+    )
+
+    assert service.matcher.calls == [["milk", "egg", "butter", "mystery"]]
+    assert [[match["ingredient_name"] for match in result] for result in results] == [["milk", "egg"], ["butter"], [None]]
+    assert results[2][0]["candidates"][0]["ingredient_name"] == "mystery"
+
+
+@pytest.mark.asyncio
+async def test_batch_is_capped_at_max_batch_size(service):
+    service.max_batch_size = 2
+
+    await asyncio.gather(service.match(["a", "b"]), service.match(["c"]))
+
+    assert service.matcher.calls == [["a", "b"], ["c"]]
+
+
+@pytest.mark.asyncio
+async def test_failure_is_reported_to_every_request_in_the_batch(service):
+    results = await asyncio.gather(service.match(["boom"]), service.match(["milk"]), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    # The batcher keeps serving afterwards
+    assert (await service.match(["egg"]))[0]["ingredient_name"] == "egg"
+
+
+@pytest.mark.asyncio
+@patch("app.services.matching_service.Config.MATCHING_ENABLED", True)
+@patch("app.matching.ingredient_matcher.create_matcher", side_effect=OSError("model download failed"))
+async def test_load_failure_leaves_matching_disabled(mock_create_matcher):
+    service = MatchingService()
+    db = MagicMock()
+    db.__getitem__.return_value.distinct = AsyncMock(return_value=["milk"])
+
+    await service.load(db)
+
+    mock_create_matcher.assert_called_once_with(["milk"])
+    assert service.is_running is False
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    matching_service.start(FakeMatcher())
+    yield
+    await matching_service.stop()
+
+
+def test_match_endpoint():
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(router, prefix="/api/v1")
+    with TestClient(app) as client:
+        response = client.post("/api/v1/match", json={"descriptions": ["milk"]})
+
+    assert response.status_code == 200
+    assert response.json()["matches"][0]["ingredient_name"] == "milk"
+
+
+def test_match_endpoint_is_unavailable_when_not_loaded():
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    with TestClient(app) as client:
+        response = client.post("/api/v1/match", json={"descriptions": ["milk"]})
+
+    assert response.status_code == 503
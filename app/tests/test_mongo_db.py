@@ -0,0 +1,86 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from fastapi import Response
+
+from app.db.db_dependencies import get_mongo_database
+from app.db.mongo_db import mongodb_client
+from app.routers.health_router import health
+
+
+@pytest_asyncio.fixture
+async def mock_motor_client():
+    with patch("app.db.mongo_db.AsyncIOMotorClient") as mock_client_class:
+        mock_client_class.side_effect = lambda *args, **kwargs: MagicMock(admin=MagicMock(command=AsyncMock()))
+        yield mock_client_class
+    await mongodb_client.close()
+    mongodb_client.is_healthy = True
+
+
+@pytest.mark.asyncio
+async def test_get_mongo_database_does_not_ping(mock_motor_client):
+    await mongodb_client.connect()
+
+    await get_mongo_database()
+    await get_mongo_database()
+
+    assert mock_motor_client.call_count == 1
+    mongodb_client.client.admin.command.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("app.db.mongo_db.Config.MONGO_COMPRESSORS", ["zlib"])
+async def test_client_uses_pool_settings(mock_motor_client):
+    mongodb_client.get_client()
+
+    options = mock_motor_client.call_args.kwargs
+    assert options["maxPoolSize"] == 100
+    assert options["compressors"] == ["zlib"]
+
+
+async def _wait_until(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_monitor_reports_health_without_replacing_client(mock_motor_client):
+    client = mongodb_client.get_client()
+    mongo_down = True
+
+    async def ping(command):
+        if mongo_down:
+            raise Exception("connection refused")
+
+    client.admin.command.side_effect = ping
+
+    mongodb_client.start_monitor(interval=0.001, failure_threshold=2)
+    # Pings keep failing until the flag flips, so the unhealthy state cannot be missed
+    await _wait_until(lambda: mongodb_client.is_healthy is False)
+    assert client.admin.command.await_count >= 2
+
+    mongo_down = False
+    await _wait_until(lambda: mongodb_client.is_healthy is True)
+
+    # The driver reconnects by itself: handles held elsewhere must stay usable
+    assert mongodb_client.client is client
+    assert mock_motor_client.call_count == 1
+    client.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_health_endpoint_reflects_monitor(mock_motor_client):
+    mongodb_client.is_healthy = False
+    response = Response()
+    assert (await health(response)) == {"status": "unavailable", "mongodb": False}
+    assert response.status_code == 503
+
+    mongodb_client.is_healthy = True
+    response = Response()
+    assert (await health(response))["status"] == "ok"
+    assert response.status_code == 200
@@ -0,0 +1,184 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pymongo.errors import PyMongoError
+
+from app.config.config import Config
+from app.repositories.mongo_repository import MongoRepository
+
+
+@pytest.fixture
+def mock_collection():
+    collection = MagicMock()
+    collection.bulk_write = AsyncMock(
+        side_effect=lambda operations, ordered: MagicMock(upserted_count=len(operations), modified_count=0,
+                                                          matched_count=0)
+    )
+    return collection
+
+
+@pytest.fixture
+def mock_history_collection():
+    collection = MagicMock()
+    collection.insert_many = AsyncMock()
+    return collection
+
+
+@pytest.fixture
+def repository(mock_collection, mock_history_collection):
+    db = MagicMock()
+    db.__getitem__.side_effect = lambda name: (
+        mock_history_collection if name == Config.MONGO_PRICE_HISTORY_COLLECTION_NAME else mock_collection
+    )
+    return MongoRepository(db)
+
+
+async def _pages(*pages, error=None):
+    for page in pages:
+        yield page
+    if error:
+        raise error
+
+
+@pytest.mark.asyncio
+async def test_save_ingredient_pages_writes_each_page(repository, mock_collection):
+    pages = _pages([{"productId": "1"}, {"productId": "2"}], [{"productId": "3"}])
+
+    counts = await repository.save_ingredient_pages(pages, "milk", "spoonacular", "1234")
+
+    assert counts == {"inserted": 3, "modified": 0, "unchanged": 0}
+    assert mock_collection.bulk_write.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_save_ingredient_pages_raises_fetch_errors(repository, mock_collection):
+    pages = _pages([{"productId": "1"}], error=Exception("Failed to fetch products"))
+
+    with pytest.raises(Exception, match="Failed to fetch products"):
+        await repository.save_ingredient_pages(pages, "milk", "spoonacular", "1234")
+
+    assert mock_collection.bulk_write.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_save_ingredient_pages_raises_write_errors(repository, mock_collection):
+    mock_collection.bulk_write = AsyncMock(side_effect=PyMongoError("write failed"))
+    pages = _pages([{"productId": "1"}], [{"productId": "2"}], [{"productId": "3"}])
+
+    with pytest.raises(PyMongoError):
+        await repository.save_ingredient_pages(pages, "milk", "spoonacular", "1234")
+
+
+@pytest.mark.asyncio
+async def test_upsert_ingredients_is_keyed_on_product_and_location(repository, mock_collection):
+    mock_collection.bulk_write = AsyncMock(
+        return_value=MagicMock(upserted_count=1, modified_count=1, matched_count=3)
+    )
+    products = [{"_id": "old", "productId": str(i), "description": "Milk"} for i in range(4)]
+
+    counts = await repository.upsert_ingredients(products, "milk", "spoonacular", "1234")
+
+    assert counts == {"inserted": 1, "modified": 1, "unchanged": 2}
+    operations = mock_collection.bulk_write.await_args.args[0]
+    assert mock_collection.bulk_write.await_args.kwargs == {"ordered": False}
+    assert operations[0]._filter == {"productId": "0", "locationId": "1234"}
+    assert "_id" not in operations[0]._doc["$set"]
+    assert operations[0]._doc["$set"]["ingredient_name"] == "milk"
+    assert "date" in operations[0]._doc["$setOnInsert"]
+    assert operations[0]._upsert is True
+
+
+@pytest.mark.asyncio
+@patch("app.repositories.mongo_repository.response_cache")
+async def test_upsert_ingredients_invalidates_only_on_changes(mock_response_cache, repository, mock_collection):
+    mock_collection.bulk_write = AsyncMock(
+        return_value=MagicMock(upserted_count=0, modified_count=0, matched_count=1)
+    )
+    await repository.upsert_ingredients([{"productId": "1"}], "milk", "spoonacular", "1234")
+    mock_response_cache.invalidate.assert_not_called()
+
+    mock_collection.bulk_write.return_value = MagicMock(upserted_count=1, modified_count=0, matched_count=0)
+    await repository.upsert_ingredients([{"productId": "2"}], "milk", "spoonacular", "1234")
+    mock_response_cache.invalidate.assert_called_once_with("milk")
+
+
+@pytest.mark.asyncio
+async def test_upsert_ingredients_empty(repository, mock_collection):
+    counts = await repository.upsert_ingredients([], "milk", "spoonacular", "1234")
+
+    assert counts == {"inserted": 0, "modified": 0, "unchanged": 0}
+    mock_collection.bulk_write.assert_not_called()
+
+
+def _product(product_id, regular, promo=0):
+    return {"productId": product_id, "items": [{"itemId": product_id, "price": {"regular": regular, "promo": promo}}]}
+
+
+@pytest.mark.asyncio
+async def test_upsert_ingredients_records_only_price_changes(repository, mock_collection, mock_history_collection):
+    mock_collection.bulk_write = AsyncMock(return_value=MagicMock(upserted_count=1, modified_count=1, matched_count=2))
+    stored = [
+        {"productId": "1", "price": {"regular": 1.99, "promo": 0}},
+        {"productId": "2", "price": {"regular": 3.49, "promo": 0}},
+    ]
+    mock_collection.find.return_value.__aiter__.return_value = stored
+
+    await repository.upsert_ingredients(
+        [_product("1", 1.99), _product("2", 2.99), _product("3", 5.00)], "milk", "spoonacular", "1234"
+    )
+
+    points = mock_history_collection.insert_many.await_args.args[0]
+    assert [point["meta"]["productId"] for point in points] == ["2", "3"]
+    assert points[0]["regular"] == 2.99
+    assert points[0]["meta"] == {"productId": "2", "locationId": "1234", "ingredient_name": "milk"}
+    operations = mock_collection.bulk_write.await_args.args[0]
+    assert operations[0]._doc["$set"]["price"] == {"regular": 1.99, "promo": 0}
+
+
+@pytest.mark.asyncio
+async def test_upsert_ingredients_without_price_changes(repository, mock_collection, mock_history_collection):
+    mock_collection.bulk_write = AsyncMock(return_value=MagicMock(upserted_count=0, modified_count=0, matched_count=1))
+    mock_collection.find.return_value.__aiter__.return_value = [
+        {"productId": "1", "price": {"regular": 1.99, "promo": 0}}
+    ]
+
+    await repository.upsert_ingredients([_product("1", 1.99)], "milk", "spoonacular", "1234")
+
+    mock_history_collection.insert_many.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upsert_ingredients_keeps_snapshot_when_history_insert_fails(repository, mock_collection,
+                                                                           mock_history_collection):
+    mock_history_collection.insert_many.side_effect = PyMongoError("write failed")
+
+    with pytest.raises(PyMongoError):
+        await repository.upsert_ingredients([_product("1", 1.99)], "milk", "spoonacular", "1234")
+
+    # The stored price is untouched, so the next run records the change again
+    mock_collection.bulk_write.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_upsert_ingredients_reports_previous_ingredients(repository, mock_collection):
+    mock_collection.find.return_value.__aiter__.return_value = [
+        {"productId": "1", "ingredient_name": "whole milk"},
+        {"productId": "2", "ingredient_name": "milk"},
+    ]
+    previous_ingredients = set()
+
+    await repository.upsert_ingredients([_product("1", 1.99), _product("2", 2.49), _product("3", 0.99)], "milk",
+                                        "spoonacular", "1234", previous_ingredients)
+
+    assert previous_ingredients == {"whole milk"}
+
+
+@pytest.mark.asyncio
+@patch("app.repositories.mongo_repository.response_cache")
+async def test_upsert_ingredients_invalidates_previous_ingredients(mock_response_cache, repository, mock_collection):
+    mock_collection.find.return_value.__aiter__.return_value = [{"productId": "1", "ingredient_name": "whole milk"}]
+    mock_collection.bulk_write = AsyncMock(return_value=MagicMock(upserted_count=0, modified_count=1, matched_count=1))
+
+    await repository.upsert_ingredients([_product("1", 1.99)], "milk", "spoonacular", "1234")
+
+    assert {call.args[0] for call in mock_response_cache.invalidate.call_args_list} == {"milk", "whole milk"}
@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+from app.matching.pipeline import run_pipeline
+
+
+def test_items_pass_through_every_stage_in_order():
+    received = []
+
+    run_pipeline(range(20), [lambda x: x * 2, lambda x: x + 1], received.append, queue_size=1)
+
+    assert received == [x * 2 + 1 for x in range(20)]
+
+
+def test_stages_run_concurrently():
+    def slow(item):
+        time.sleep(0.05)
+        return item
+
+    start_time = time.time()
+    run_pipeline(range(5), [slow, slow, slow], lambda item: None)
+
+    # Sequential would take 15 * 0.05s; pipelined about (5 + 2) * 0.05s
+    assert time.time() - start_time < 0.6
+
+
+def test_stage_error_stops_the_pipeline_and_is_raised():
+    received = []
+
+    def fail_on_three(item):
+        if item == 3:
+            raise ValueError("bad batch")
+        return item
+
+    with pytest.raises(ValueError, match="bad batch"):
+        run_pipeline(range(100), [fail_on_three], received.append, queue_size=1)
+
+    assert received == [0, 1, 2]
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("pipeline-")]
+
+
+def test_sink_error_stops_the_reader():
+    def sink(item):
+        raise RuntimeError("write failed")
+
+    with pytest.raises(RuntimeError):
+        run_pipeline(iter(range(10_000)), [lambda x: x], sink, queue_size=1)
+
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("pipeline-")]
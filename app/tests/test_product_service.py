@@ -0,0 +1,163 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from app.config.config import Config
+from app.db.db_dependencies import get_mongo_database
+from app.handlers.response_cache import response_cache
+from app.repositories.mongo_repository import MongoRepository
+from app.repositories.price_summary_repository import PriceSummaryRepository
+from app.routers.products_router import router
+from app.services.product_service import ProductService
+
+
+def _product(day):
+    return {"_id": ObjectId(), "productId": f"p{day}", "date": datetime(2024, 1, day)}
+
+
+@pytest.fixture
+def service():
+    service = ProductService(MagicMock())
+    service.repository = AsyncMock(spec=MongoRepository)
+    return service
+
+
+def test_cursor_round_trip():
+    product = _product(5)
+
+    assert ProductService.decode_cursor(ProductService.encode_cursor(product)) == (product["date"], product["_id"])
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30="])
+def test_decode_cursor_rejects_invalid_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        ProductService.decode_cursor(cursor)
+
+
+def test_parse_fields():
+    assert ProductService.parse_fields(None) == ProductService.DEFAULT_FIELDS
+    assert ProductService.parse_fields("productId, price.regular") == ["productId", "price.regular"]
+    with pytest.raises(ValueError, match="Invalid fields"):
+        ProductService.parse_fields("productId,$where")
+    with pytest.raises(ValueError, match="overlap"):
+        ProductService.parse_fields("price,price.regular")
+    with pytest.raises(ValueError, match="overlap"):
+        ProductService.parse_fields("date.day")
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.dependency_overrides[get_mongo_database] = lambda: MagicMock()
+    response_cache.clear()
+    yield TestClient(app)
+    response_cache.clear()
+
+
+@pytest.mark.parametrize("params, detail", [
+    ({"cursor": "not-a-cursor"}, "Invalid cursor"),
+    ({"fields": "price,price.regular"}, "overlap"),
+    ({"fields": "$where"}, "Invalid fields"),
+])
+def test_list_products_endpoint_rejects_invalid_input(client, params, detail):
+    with patch.object(MongoRepository, "find_products", new_callable=AsyncMock) as mock_find_products:
+        response = client.get("/api/v1/products", params=params)
+
+    assert response.status_code == 400
+    assert detail in response.json()["detail"]
+    mock_find_products.assert_not_called()
+
+
+def test_list_products_endpoint(client):
+    products = [_product(2), _product(1)]
+    with patch.object(MongoRepository, "find_products", new_callable=AsyncMock, return_value=products):
+        response = client.get("/api/v1/products", params={"ingredient_name": "milk", "limit": 1})
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["productId"] == "p2"
+    assert response.json()["next_cursor"]
+
+
+@pytest.mark.asyncio
+async def test_list_products_returns_cursor_of_last_item(service):
+    products = [_product(day) for day in (3, 2, 1)]
+    service.repository.find_products.return_value = products
+
+    page = await service.list_products(limit=2, ingredient_name="milk")
+
+    assert [item["productId"] for item in page["items"]] == ["p3", "p2"]
+    assert page["items"][0]["id"] == str(products[0]["_id"])
+    assert ProductService.decode_cursor(page["next_cursor"]) == (products[1]["date"], products[1]["_id"])
+    # One extra product is requested to tell whether there is a next page
+    assert service.repository.find_products.await_args.kwargs["limit"] == 3
+    assert service.repository.find_products.await_args.kwargs["ingredient_name"] == "milk"
+
+
+@pytest.mark.asyncio
+async def test_list_products_last_page(service):
+    service.repository.find_products.return_value = [_product(1)]
+
+    page = await service.list_products(limit=2)
+
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_products_passes_cursor_to_repository(service):
+    last = _product(2)
+    service.repository.find_products.return_value = []
+
+    await service.list_products(cursor=ProductService.encode_cursor(last))
+
+    assert service.repository.find_products.await_args.kwargs["after"] == (last["date"], last["_id"])
+
+
+@pytest.mark.asyncio
+async def test_find_products_builds_keyset_query():
+    collection = MagicMock()
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    last = _product(2)
+
+    await MongoRepository(db).find_products(location_id="01400943", min_price=1.5, fields=["price"],
+                                            after=(last["date"], last["_id"]), limit=10)
+
+    query, projection = collection.find.call_args.args
+    assert query["locationId"] == "01400943"
+    assert query["price.regular"] == {"$gte": 1.5}
+    assert query["$or"] == [{"date": {"$lt": last["date"]}}, {"date": last["date"], "_id": {"$lt": last["_id"]}}]
+    assert projection == {"price": 1, "date": 1}
+    collection.find.return_value.sort.return_value.limit.assert_called_once_with(10)
+
+
+def test_price_summary_pipeline_merges_into_summaries():
+    updated_at = datetime(2024, 1, 1)
+
+    pipeline = PriceSummaryRepository.pipeline(["milk"], updated_at)
+
+    assert pipeline[0]["$match"]["ingredient_name"] == {"$in": ["milk"]}
+    assert pipeline[-1]["$merge"]["on"] == ["ingredient_name", "locationId"]
+    assert pipeline[-1]["$merge"]["into"] == Config.MONGO_PRICE_SUMMARY_COLLECTION_NAME
+    assert PriceSummaryRepository.stale_query(["milk"], updated_at)["updated_at"] == {"$lt": updated_at}
+
+
+@pytest.mark.asyncio
+async def test_price_summary_refresh_runs_merge_and_drops_stale_summaries():
+    products_collection = MagicMock()
+    products_collection.aggregate.return_value.to_list = AsyncMock(return_value=[])
+    summary_collection = MagicMock(delete_many=AsyncMock())
+    db = MagicMock()
+    db.__getitem__.side_effect = lambda name: (
+        summary_collection if name == Config.MONGO_PRICE_SUMMARY_COLLECTION_NAME else products_collection
+    )
+
+    await PriceSummaryRepository(db).refresh({"milk", "egg"})
+
+    pipeline = products_collection.aggregate.call_args.args[0]
+    assert pipeline[0]["$match"]["ingredient_name"] == {"$in": ["egg", "milk"]}
+    assert summary_collection.delete_many.await_args.args[0]["ingredient_name"] == {"$in": ["egg", "milk"]}
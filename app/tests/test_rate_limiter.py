@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from app.api.rate_limiter import HostRateLimiter, TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate_after_burst():
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        await bucket.acquire()
+
+    # Two tokens come from the burst, the other two take 1/20 sec each
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_backoff_pauses_only_the_throttled_host():
+    limiter = HostRateLimiter(rate=100, burst=100, max_in_flight=5)
+
+    delay = limiter.backoff("https://api.kroger.com/v1/products", "0.2", attempt=0)
+    assert delay == pytest.approx(0.2)
+
+    start = time.monotonic()
+    async with limiter.limit("https://api.spoonacular.com/recipes/random"):
+        pass
+    assert time.monotonic() - start < 0.1
+
+    async with limiter.limit("https://api.kroger.com/v1/products"):
+        pass
+    assert time.monotonic() - start >= 0.15
+
+
+def test_parse_retry_after():
+    assert HostRateLimiter.parse_retry_after("5") == 5
+    assert HostRateLimiter.parse_retry_after(None) is None
+    assert HostRateLimiter.parse_retry_after("not a date") is None
+    # Dates in the past mean "retry now"
+    assert HostRateLimiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+@pytest.mark.asyncio
+async def test_backoff_without_retry_after_is_exponential():
+    limiter = HostRateLimiter(rate=10, burst=10, max_in_flight=5)
+
+    assert limiter.backoff("https://api.kroger.com/v1/products", None, attempt=0) == 1
+    assert limiter.backoff("https://api.kroger.com/v1/products", None, attempt=3) == 8
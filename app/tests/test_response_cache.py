@@ -0,0 +1,94 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, Request
+from starlette.testclient import TestClient
+
+from app.handlers.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache(max_entries=2, ttl=60)
+
+
+@pytest.fixture
+def client(cache):
+    app = FastAPI()
+    calls = []
+
+    @app.get("/items")
+    async def items(request: Request, ingredient_name: str = None):
+        async def produce():
+            calls.append(ingredient_name)
+            return {"ingredient_name": ingredient_name, "calls": len(calls)}
+
+        return await cache.respond(request, produce, ingredient_name=ingredient_name)
+
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+def test_evicts_least_recently_used(cache):
+    cache.put("a", b"a", '"a"')
+    cache.put("b", b"b", '"b"')
+    cache.get("a")
+    cache.put("c", b"c", '"c"')
+
+    assert cache.get("b") is None
+    assert cache.get("a") == (b"a", '"a"')
+    assert len(cache) == 2
+
+
+def test_entries_expire(cache):
+    with patch("app.handlers.response_cache.time.monotonic", return_value=1000):
+        cache.put("a", b"a", '"a"')
+    with patch("app.handlers.response_cache.time.monotonic", return_value=1061):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_drops_ingredient_and_unscoped_entries(cache):
+    cache.max_entries = 10
+    cache.put("milk", b"1", '"1"', ingredient_name="milk")
+    cache.put("egg", b"2", '"2"', ingredient_name="egg")
+    cache.put("all", b"3", '"3"')
+
+    cache.invalidate("milk")
+
+    assert cache.get("milk") is None
+    assert cache.get("all") is None
+    assert cache.get("egg") == (b"2", '"2"')
+
+
+def test_etag_matches():
+    assert ResponseCache.etag_matches('"x", W/"y"', '"y"')
+    assert ResponseCache.etag_matches("*", '"y"')
+    assert not ResponseCache.etag_matches(None, '"y"')
+
+
+def test_respond_serves_cache_and_not_modified(client, cache):
+    first = client.get("/items", params={"ingredient_name": "milk"})
+    second = client.get("/items", params={"ingredient_name": "milk"})
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert client.calls == ["milk"]
+
+    not_modified = client.get("/items", params={"ingredient_name": "milk"},
+                              headers={"If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == first.headers["ETag"]
+    assert not_modified.content == b""
+
+
+def test_respond_produces_again_after_invalidation(client, cache):
+    first = client.get("/items", params={"ingredient_name": "milk"})
+    cache.invalidate("milk")
+
+    second = client.get("/items", params={"ingredient_name": "milk"}, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.json()["calls"] == 2
+    assert second.headers["ETag"] != first.headers["ETag"]
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from app.services.scrap_scheduler import ScrapScheduler
+
+
+@pytest.mark.asyncio
+async def test_run_caps_jobs_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def job(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return item * 2
+
+    results = await ScrapScheduler(max_concurrency=3).run(range(10), job)
+
+    assert results == [item * 2 for item in range(10)]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_run_keeps_going_after_a_failed_job():
+    async def job(item):
+        if item == "bad":
+            raise ValueError("boom")
+        return item
+
+    results = await ScrapScheduler(max_concurrency=2).run(["milk", "bad", "egg"], job)
+
+    assert results[0] == "milk"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "egg"
+
+
+@pytest.mark.asyncio
+async def test_run_pulls_items_lazily():
+    pulled = 0
+    max_ahead = 0
+    finished = 0
+
+    def items():
+        nonlocal pulled
+        for item in range(10):
+            pulled += 1
+            yield item
+
+    async def job(item):
+        nonlocal max_ahead, finished
+        max_ahead = max(max_ahead, pulled - finished)
+        await asyncio.sleep(0.001)
+        finished += 1
+        return item
+
+    results = await ScrapScheduler(max_concurrency=2).run(items(), job)
+
+    assert results == list(range(10))
+    # Never more items taken than workers
+    assert max_ahead <= 2
@@ -0,0 +1,154 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.repositories.freshness_repository import FreshnessRepository
+from app.repositories.ingredient_frontier_repository import IngredientFrontierRepository
+from app.repositories.mongo_repository import MongoRepository
+from app.repositories.price_summary_repository import PriceSummaryRepository
+from app.services.scrap_service import ScrapService
+
+
+@pytest.fixture
+def service():
+    service = ScrapService(MagicMock(), location_ids=["store-1", {"locationId": "store-2"}, "store-1"])
+    service.repository = AsyncMock(spec=MongoRepository)
+    service.freshness_repository = AsyncMock(spec=FreshnessRepository)
+    service.freshness_repository.find_fresh.return_value = None
+    service.frontier_repository = AsyncMock(spec=IngredientFrontierRepository)
+    service.price_summary_repository = AsyncMock(spec=PriceSummaryRepository)
+    return service
+
+
+def _kroger_client(pages):
+    async def iter_product_pages():
+        for page in pages:
+            yield page
+
+    client = MagicMock()
+    client.iter_product_pages.side_effect = iter_product_pages
+    return client
+
+
+async def _consume_pages(pages, ingredient_name, source_id, location_id, previous_ingredients=None):
+    products = [product async for page in pages for product in page]
+    return {"inserted": len(products), "modified": 0, "unchanged": 0}
+
+
+def test_location_ids_accept_ids_and_store_dicts(service):
+    assert service.location_ids == ["store-1", "store-2"]
+
+
+@pytest.mark.asyncio
+@patch("app.services.scrap_service.KrogerAPIClient")
+async def test_process_ingredients_fans_out_over_stores(mock_kroger_client, service):
+    mock_kroger_client.side_effect = lambda keyword, location_id: _kroger_client([[{"productId": keyword}]])
+
+    async def save_ingredient_pages(pages, ingredient_name, source_id, location_id, previous_ingredients):
+        if location_id == "store-2" and ingredient_name == "egg":
+            raise RuntimeError("boom")
+        if ingredient_name == "milk":
+            # A product found earlier by the "whole milk" search moves to "milk"
+            previous_ingredients.add("whole milk")
+        return {"inserted": 2, "modified": 0, "unchanged": 1}
+
+    service.repository.save_ingredient_pages.side_effect = save_ingredient_pages
+
+    await service.process_ingredients({"milk", "egg"})
+
+    scraped = {(call.args[1], call.args[3]) for call in service.repository.save_ingredient_pages.await_args_list}
+    assert scraped == {("milk", "store-1"), ("milk", "store-2"), ("egg", "store-1"), ("egg", "store-2")}
+    assert service.stats["ingredients_total"] == 4
+    assert service.stats["ingredients_done"] == 3
+    assert service.stats["ingredients_failed"] == 1
+    assert service.stats["inserted"] == 6
+    assert service.stats["stores"]["store-1"] == {
+        "done": 2, "failed": 0, "fresh": 0, "inserted": 4, "modified": 0, "unchanged": 2
+    }
+    assert service.stats["stores"]["store-2"]["failed"] == 1
+    # egg still saved new products in store-1; "whole milk" lost a product
+    assert service.touched_ingredients == {"milk", "egg", "whole milk"}
+
+
+@pytest.mark.asyncio
+async def test_start_scraping_refreshes_summaries_of_touched_ingredients(service):
+    service.fetch_ingredients_from_spoonacular = AsyncMock(return_value={"milk", "egg"})
+
+    async def process_ingredients(ingredients):
+        service.touched_ingredients.add("milk")
+
+    service.process_ingredients = process_ingredients
+
+    with patch("app.services.scrap_service.Config.SCRAPE_INGREDIENT_SOURCE", "recipes"):
+        await service.start_scraping()
+
+    service.price_summary_repository.refresh.assert_awaited_once_with({"milk"})
+
+
+@pytest.mark.asyncio
+@patch("app.services.scrap_service.KrogerAPIClient")
+async def test_fresh_pair_with_unchanged_first_page_is_not_rescraped(mock_kroger_client, service):
+    first_page = [{"productId": "1"}]
+    pages_fetched = []
+
+    async def iter_product_pages():
+        for page in (first_page, [{"productId": "2"}]):
+            pages_fetched.append(page)
+            yield page
+
+    mock_kroger_client.return_value.iter_product_pages.side_effect = iter_product_pages
+    service.freshness_repository.find_fresh.return_value = {"first_page_hash": ScrapService.page_hash(first_page)}
+
+    await service.fetch_from_kroger("milk", "store-1")
+
+    assert pages_fetched == [first_page]
+    service.repository.save_ingredient_pages.assert_not_called()
+    service.freshness_repository.mark_checked.assert_awaited_once_with("milk", "store-1")
+    assert service.stats["ingredients_fresh"] == 1
+    assert service.stats["stores"]["store-1"]["fresh"] == 1
+
+
+@pytest.mark.asyncio
+@patch("app.services.scrap_service.KrogerAPIClient")
+async def test_fresh_pair_with_changed_first_page_is_fully_rescraped(mock_kroger_client, service):
+    pages = [[{"productId": "1", "price": 2}], [{"productId": "2"}]]
+    mock_kroger_client.return_value = _kroger_client(pages)
+    service.freshness_repository.find_fresh.return_value = {"first_page_hash": ScrapService.page_hash([{"productId": "1"}])}
+    service.repository.save_ingredient_pages.side_effect = _consume_pages
+
+    await service.fetch_from_kroger("milk", "store-1")
+
+    assert service.stats["inserted"] == 2
+    assert service.stats["ingredients_fresh"] == 0
+    service.freshness_repository.mark_scraped.assert_awaited_once_with(
+        "milk", "store-1", 2, ScrapService.page_hash(pages[0])
+    )
+
+
+@pytest.mark.asyncio
+@patch("app.services.scrap_service.Config.SCRAPE_FRESH_MODE", "skip")
+@patch("app.services.scrap_service.KrogerAPIClient")
+async def test_fresh_pair_is_skipped_in_skip_mode(mock_kroger_client, service):
+    service.freshness_repository.find_fresh.return_value = {"first_page_hash": "any"}
+
+    await service.fetch_from_kroger("milk", "store-1")
+
+    mock_kroger_client.assert_not_called()
+    assert service.stats["ingredients_fresh"] == 1
+
+
+@pytest.mark.asyncio
+async def test_start_scraping_draws_from_the_frontier(service):
+    service.spoonacular_client = MagicMock()
+    service.spoonacular_client.fetch_random_recipe = AsyncMock(return_value={"recipes": [
+        {"extendedIngredients": [{"name": "milk"}, {"name": "egg"}]},
+        {"extendedIngredients": [{"name": "flour"}]},
+    ]})
+    service.frontier_repository.take_batch.return_value = ["milk", "butter"]
+    service.process_ingredients = AsyncMock()
+
+    await service.start_scraping()
+
+    service.frontier_repository.add_many.assert_awaited_once_with({"milk", "egg", "flour"})
+    service.process_ingredients.assert_awaited_once_with({"milk", "butter"})
+    assert set(service.frontier_repository.mark_scraped.await_args.args[0]) == {"milk", "butter"}
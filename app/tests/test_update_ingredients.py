@@ -0,0 +1,140 @@
+import pytest
+
+from app.scripts import update_ingredients
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents = sorted(self.documents, key=lambda document: document[key], reverse=direction < 0)
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        return iter(self.documents)
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for the update loop: _id lookups, $exists/$gt filters, $set updates."""
+
+    def __init__(self, name, documents=()):
+        self.name = name
+        self.documents = {document["_id"]: dict(document) for document in documents}
+        self.queries = []
+
+    @staticmethod
+    def _matches(document, query):
+        for field, condition in query.items():
+            if isinstance(condition, dict):
+                if "$exists" in condition and (field in document) != condition["$exists"]:
+                    return False
+                if "$gt" in condition and not document.get(field, float("-inf")) > condition["$gt"]:
+                    return False
+                if "$in" in condition and document.get(field) not in condition["$in"]:
+                    return False
+            elif document.get(field) != condition:
+                return False
+        return True
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return FakeCursor([dict(document) for document in self.documents.values() if self._matches(document, query)])
+
+    def find_one(self, query):
+        return next((document for document in self.documents.values() if self._matches(document, query)), None)
+
+    def update_one(self, query, update, upsert=False):
+        document = self.find_one(query)
+        if document is None and upsert:
+            document = self.documents.setdefault(query["_id"], {"_id": query["_id"]})
+        if document is not None:
+            document.update(update["$set"])
+
+    def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            self.update_one(operation._filter, operation._doc, operation._upsert)
+
+    def delete_one(self, query):
+        document = self.find_one(query)
+        if document is not None:
+            del self.documents[document["_id"]]
+
+    def delete_many(self, query):
+        for document in [document for document in self.documents.values() if self._matches(document, query)]:
+            del self.documents[document["_id"]]
+
+
+class FakeMatcher:
+    min_score = 0.5
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.matched = []
+        self.ingredient_index = type("Index", (), {"index_hash": "hash"})()
+
+    def match(self, descriptions):
+        if self.fail_on in descriptions:
+            raise RuntimeError("interrupted")
+        self.matched.extend(descriptions)
+        return [[{"ingredient_name": description, "score": 0.9}] for description in descriptions]
+
+    @staticmethod
+    def accept(candidates):
+        return candidates[0] if candidates else None
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    # Product 4 has no description: it never gets an ingredient_name, only the checkpoint moves past it
+    products = FakeCollection("products", [
+        {"_id": product_id, "description": "" if product_id == 4 else f"product {product_id}"}
+        for product_id in range(1, 8)
+    ])
+    checkpoints = FakeCollection("checkpoints")
+    monkeypatch.setattr(update_ingredients, "products_collection", products)
+    monkeypatch.setattr(update_ingredients, "checkpoints_collection", checkpoints)
+    monkeypatch.setattr(update_ingredients, "review_collection", FakeCollection("review"))
+    monkeypatch.setattr(update_ingredients, "description_cache", type("Cache", (), {"hit_rate": lambda self: 0})())
+    monkeypatch.setattr(update_ingredients, "touched_ingredients", set())
+    return products, checkpoints
+
+
+def test_streaming_resumes_after_checkpoint_and_clears_it(collections, monkeypatch):
+    products, checkpoints = collections
+
+    interrupted = FakeMatcher(fail_on="product 5")
+    monkeypatch.setattr(update_ingredients, "matcher", interrupted)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        update_ingredients.update_products_streaming(batch_size=3)
+
+    # The first batch (1-3) was written and checkpointed, the failed one was not
+    assert interrupted.matched == ["product 1", "product 2", "product 3"]
+    assert checkpoints.find_one({"_id": "products"})["last_id"] == 3
+
+    resumed = FakeMatcher()
+    monkeypatch.setattr(update_ingredients, "matcher", resumed)
+    update_ingredients.update_products_streaming(batch_size=3)
+
+    assert products.queries[-1]["_id"] == {"$gt": 3}
+    # Nothing skipped, nothing matched twice
+    assert resumed.matched == ["product 5", "product 6", "product 7"]
+    assert all("ingredient_name" in products.documents[product_id] for product_id in (1, 2, 3, 5, 6, 7))
+    assert "ingredient_name" not in products.documents[4]
+    # A full pass clears the checkpoint, so the next run starts over (and only sees new products)
+    assert checkpoints.find_one({"_id": "products"}) is None
+
+
+def test_checkpoint_is_the_last_id_of_each_batch(collections, monkeypatch):
+    _, checkpoints = collections
+    saved = []
+    monkeypatch.setattr(update_ingredients, "matcher", FakeMatcher())
+    monkeypatch.setattr(update_ingredients, "save_checkpoint", saved.append)
+
+    update_ingredients.update_products_streaming(batch_size=3)
+
+    # Batches 1-3, 4-6 and 7: product 4 has no description but still moves the checkpoint
+    assert saved == [3, 6, 7]
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import threading
+
+import pytest
+import pytest_asyncio
+
+from app.handlers.web_socket_handler import LogBroadcaster
+
+
+@pytest_asyncio.fixture
+async def broadcaster():
+    broadcaster = LogBroadcaster()
+    broadcaster.start(queue_size=3, flush_interval=0.01, history_size=10)
+    yield broadcaster
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_lines_are_batched(broadcaster):
+    subscription = broadcaster.subscribe()
+
+    broadcaster.publish("first")
+    broadcaster.publish("second")
+
+    assert await subscription.next_batch() == "first\nsecond"
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_lines(broadcaster):
+    subscription = broadcaster.subscribe()
+
+    for i in range(5):
+        broadcaster.publish(f"line {i}")
+
+    assert await subscription.next_batch() == "line 2\nline 3\nline 4"
+
+
+@pytest.mark.asyncio
+async def test_subscription_filters(broadcaster):
+    subscription = broadcaster.subscribe(min_level=logging.WARNING, ingredient="Milk")
+
+    broadcaster.publish("Fetching ingredient 'milk' from Kroger API...", logging.INFO)
+    broadcaster.publish("No products found for 'milk'. Skipping.", logging.WARNING)
+    broadcaster.publish("No products found for 'egg'. Skipping.", logging.WARNING)
+
+    assert await subscription.next_batch() == "No products found for 'milk'. Skipping."
+
+
+@pytest.mark.asyncio
+async def test_subscribe_replays_recent_lines(broadcaster):
+    for i in range(5):
+        broadcaster.publish(f"line {i}")
+
+    subscription = broadcaster.subscribe(replay=2)
+
+    assert await subscription.next_batch() == "line 3\nline 4"
+
+
+@pytest.mark.asyncio
+async def test_unsubscribed_clients_receive_nothing(broadcaster):
+    subscription = broadcaster.subscribe()
+    broadcaster.unsubscribe(subscription)
+
+    broadcaster.publish("hello")
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(subscription.next_batch(), 0.05)
+
+
+@pytest.mark.asyncio
+async def test_publish_from_another_thread(broadcaster):
+    subscription = broadcaster.subscribe()
+
+    thread = threading.Thread(target=broadcaster.publish_threadsafe, args=("from thread", logging.INFO))
+    thread.start()
+    thread.join()
+
+    assert await asyncio.wait_for(subscription.next_batch(), 1) == "from thread"